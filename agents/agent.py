@@ -1,42 +1,94 @@
+import asyncio
+import contextvars
 import json
-import os
 import logging
-from datetime import datetime
-from pathlib import Path
+import threading
+import time
 from typing import Any
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
-from prompts.templates import question_prompt, evaluation_prompt, feedback_prompt, hint_prompt, weight_prompt
-from utils.vector_store import VectorStore
-from utils.types import InterviewState
-
-logging.basicConfig(
-    filename="interview.log",
-    level=logging.INFO,
-    format="%(asctime)s - %(message)s"
+from langchain_core.messages import AIMessage
+from prompts.templates import (
+    question_prompt, evaluation_prompt, feedback_prompt, hint_prompt, weight_prompt, repair_prompt,
+    cache_ttls, response_schemas
 )
+from utils import resources
+from utils.answers import InteractiveAnswers
+from utils.event_log import log_event, session_id_var
+from utils.llm_decoder import DecodeError
+from utils.llm_scheduler import estimate_tokens
+from utils.metrics import metrics
+from utils.streaming import partial_json_string, print_tokens
+from utils.transcript import add_entry, asked_questions, history_for_prompt
+from utils.types import InterviewState
 
 load_dotenv()
 
 class InterviewerAgent:
-    def __init__(self):
-        self.llm = ChatOpenAI(
-            model="gpt-4o-mini",
-            api_key=os.getenv("OPENAI_API_KEY"),
-            temperature=0.7
-        )
-        logging.info("Initialized LLM with OpenAI (gpt-4o-mini)")
-        self.vector_store = VectorStore()
+    def __init__(self, prefetch: bool = False, cache: bool = True, stream: bool = False, local_weights: bool = False,
+                 prescore: bool = True):
+        # The LLM client, response cache, embedder and vector store are shared
+        # process-wide and loaded on first use; only interview state and
+        # used_questions are per agent.
+        self.llm_cache = resources.get_llm_cache() if cache else None
+        self.decoder = resources.get_decoder()
         self.max_questions = 5
         self.max_hints = 1
         self.used_questions = set()
         self.difficulty_levels = ["easy", "medium", "hard"]
+        # Speculative prefetch: while an answer is being evaluated, candidate
+        # next questions are generated for every difficulty decide_next may pick.
+        self.prefetch = prefetch
+        self.executor = resources.get_executor() if prefetch else None
+        self.prefetched = {}
+        self.spare_questions = {}
+        # Prompts of pending prefetch calls, and difficulties already chosen
+        # whose calls must run at question priority; guarded by prefetch_lock.
+        self.prefetch_prompts = {}
+        self.promoted = set()
+        self.prefetch_lock = threading.Lock()
+        # Streaming: hints, follow-ups and the summary are passed to token_sink
+        # token by token as ("start", label), ("token", text) and ("end", "").
+        self.stream = stream
+        self.token_sink = print_tokens
+        # Console output of questions, hints and the summary; headless runtimes silence it.
+        self.output = print
+        # Where select_topic and collect_answer get the topic and answers; see utils/answers.py.
+        self.answers = InteractiveAnswers()
+        # End-of-interview scoring: weights come from the LLM unless local_weights
+        # is set, in which case they are derived from question difficulty.
+        self.local_weights = local_weights
+        self.difficulty_weights = {"easy": 1.0, "medium": 2.0, "hard": 3.0}
+        self.call_timeout = 30
+        # Cheap-first evaluation: trivial answers are scored locally from their
+        # similarity to the answer key (utils/pre_scorer.py) instead of by the LLM.
+        self.prescore = prescore
+
+    @property
+    def scheduler(self):
+        return resources.get_scheduler()
+
+    @property
+    def vector_store(self):
+        return resources.get_vector_store()
+
+    @property
+    def pre_scorer(self):
+        return resources.get_pre_scorer()
 
     def select_topic(self, state: InterviewState) -> InterviewState:
-        topic = input("Enter a technical topic for the interview (e.g., Python, Data Structures): ").strip()
-        while not topic or len(topic) < 3:
-            print("Please enter a valid topic (at least 3 characters).")
-            topic = input("Enter a technical topic: ").strip()
+        return self.start_state(self.answers.topic())
+
+    def start_topic(self, state: InterviewState) -> InterviewState:
+        """Headless select_topic: start the interview on the topic already in state."""
+        return self.start_state(state["topic"])
+
+    def restore(self, state: InterviewState):
+        """Rebuild per-session bookkeeping when resuming from a checkpoint."""
+        self.used_questions = set(asked_questions(state.get("history", [])))
+        self.reset_prefetch()
+        logging.info("Restored interview on %s at question %d", state.get("topic"), state.get("question_count", 0))
+
+    def start_state(self, topic: str) -> InterviewState:
         new_state = {
             "topic": topic,
             "question_count": 0,
@@ -44,7 +96,7 @@ class InterviewerAgent:
             "answers": [],
             "scores": [],
             "feedbacks": [],
-            "history": "",
+            "history": [],
             "current_question": {},
             "current_answer": "",
             "decision": "",
@@ -55,13 +107,235 @@ class InterviewerAgent:
             "follow_up_scores": [],
             "follow_up_feedbacks": []
         }
-        logging.info(f"Selected topic: {topic}")
-        logging.debug(f"Initial state: {new_state}")
+        log_event("topic_selected", "Selected topic: %s", topic, topic=topic)
+        logging.debug("Initial state: %s", new_state)
         self.used_questions.clear()
+        self.reset_prefetch()
         return new_state
 
+    def invoke_llm(self, template: str, prompt: str, validate=None, priority: str = None):
+        """Invoke the LLM through the scheduler, serving cacheable templates from the response cache.
+
+        Only responses accepted by validate (if given) are stored in or served from the cache.
+        """
+        priority = priority or template
+        ttl = cache_ttls.get(template)
+        if self.llm_cache is None or ttl is None:
+            response = self.scheduler.invoke(prompt, priority, route=template)
+            self.record_usage(template, prompt, response)
+            return response
+        llm = resources.get_llm(template)
+        key = self.llm_cache.make_key(llm.model_name, llm.temperature, prompt)
+        cached = self.llm_cache.get(key, template, ttl)
+        if cached is not None and self.is_valid(validate, cached):
+            logging.info("LLM cache hit for %s prompt", template)
+            metrics.increment("llm_cache_total", template=template, result="hit")
+            return AIMessage(content=cached)
+        metrics.increment("llm_cache_total", template=template, result="miss")
+        response = self.scheduler.invoke(prompt, priority, route=template)
+        self.record_usage(template, prompt, response)
+        if self.is_valid(validate, response.content):
+            self.llm_cache.put(key, template, response.content)
+        return response
+
+    @staticmethod
+    def record_usage(template: str, prompt: str, response):
+        """Count prompt and completion tokens, estimating them if the client reports no usage."""
+        usage = getattr(response, "usage_metadata", None) or {}
+        metrics.increment("llm_tokens_total", usage.get("input_tokens") or estimate_tokens(prompt), template=template, kind="prompt")
+        metrics.increment("llm_tokens_total", usage.get("output_tokens") or estimate_tokens(response.content), template=template, kind="completion")
+
+    @staticmethod
+    def is_valid(validate, text: str) -> bool:
+        if validate is None:
+            return True
+        try:
+            validate(text)
+            return True
+        except DecodeError:
+            return False
+
+    def request_json(self, template: str, prompt: str, stream_field: str = None, label=None, priority: str = None) -> tuple[dict | None, bool]:
+        """Call the LLM for template and decode its JSON response.
+
+        A response that fails to decode gets a single repair call. Returns the
+        decoded object (None if it could not be recovered) and whether it was streamed.
+        """
+        decode = lambda text: self.decoder.decode(template, text)
+        streamed = False
+        with metrics.span("llm_request", template=template):
+            if self.stream and stream_field:
+                response, streamed = self.stream_llm(template, prompt, stream_field, label)
+            else:
+                response = self.invoke_llm(template, prompt, validate=decode, priority=priority)
+        log_event(
+            "llm_response", "%s LLM response (%d chars)", template.capitalize(), len(response.content),
+            payload=response.content, template=template, chars=len(response.content), streamed=streamed
+        )
+        try:
+            return decode(response.content), streamed
+        except DecodeError as e:
+            self.decoder.record(self.decoder.failures, template)
+            logging.warning("%s response failed to decode (%s), retrying with repair prompt", template.capitalize(), e)
+
+        repair = repair_prompt.format(
+            keys=", ".join(response_schemas.get(template, {})),
+            response=response.content[:4000]
+        )
+        try:
+            with metrics.span("llm_request", template=f"{template}_repair"):
+                response = self.scheduler.invoke(repair, priority or template, route=template)
+            self.record_usage(f"{template}_repair", repair, response)
+            data = decode(response.content)
+            self.decoder.record(self.decoder.repaired, template)
+            return data, streamed
+        except DecodeError:
+            self.decoder.record(self.decoder.unrecovered, template)
+            logging.warning("%s response could not be repaired", template.capitalize())
+            return None, streamed
+
+    def stream_llm(self, template: str, prompt: str, field: str, label) -> tuple[AIMessage, bool]:
+        """Stream the LLM response, passing the growing value of field to the token sink.
+
+        label is called with the partial response text when field first appears and
+        returns the label shown before the streamed text. Returns the full response
+        and whether any tokens were shown.
+        """
+        start = time.perf_counter()
+        text = ""
+        shown = 0
+        for chunk in self.scheduler.stream(prompt, template, route=template):
+            text += chunk.content
+            value = partial_json_string(text, field)
+            if value is None or len(value) <= shown:
+                continue
+            if not shown:
+                first_token = time.perf_counter() - start
+                metrics.observe("llm_first_token_seconds", first_token, template=template)
+                log_event("llm_first_token", "%s time to first token: %.3fs", template, first_token, template=template, seconds=first_token)
+                self.token_sink("start", label(text))
+            self.token_sink("token", value[shown:])
+            shown = len(value)
+        if shown:
+            self.token_sink("end", "")
+        response = AIMessage(content=text)
+        self.record_usage(template, prompt, response)
+        elapsed = time.perf_counter() - start
+        log_event("llm_stream", "%s streamed in %.3fs", template, elapsed, template=template, seconds=elapsed)
+        return response, bool(shown)
+
+    def fallback_question(self, topic: str, difficulty: str) -> dict:
+        return {
+            "question": f"Explain a {difficulty} concept in {topic}.",
+            "answer_key": f"Provide a detailed explanation of a {difficulty} concept in {topic}.",
+            "difficulty": difficulty,
+            # The answer key is an instruction, not an answer, so answers are not compared with it.
+            "placeholder_key": True
+        }
+
+    def fetch_question(self, topic: str, difficulty: str, history: str, priority: str = "question") -> tuple[dict, str]:
+        """Retrieve a question from the vector store, falling back to the LLM."""
+        question = self.vector_store.retrieve_question(topic, difficulty, exclude=self.used_questions)
+        if question:
+            return question, "vector_store"
+        prompt = question_prompt.format(
+            topic=topic,
+            difficulty=difficulty,
+            history=history
+        )
+        if priority == "prefetch":
+            with self.prefetch_lock:
+                self.prefetch_prompts[difficulty] = prompt
+                if difficulty in self.promoted:
+                    priority = "question"
+        question, _ = self.request_json("question", prompt, priority=priority)
+        if question is None or question["question"] in self.used_questions:
+            question = self.fallback_question(topic, difficulty)
+        question.setdefault("difficulty", difficulty)
+        return question, "llm"
+
+    def async_node(self, node):
+        """Wrap a blocking graph node as a coroutine that runs on the shared node executor."""
+        async def run(state: InterviewState) -> InterviewState:
+            loop = asyncio.get_running_loop()
+            # Run in a copy of the caller's context so log records keep the session ID.
+            return await loop.run_in_executor(resources.get_node_executor(), contextvars.copy_context().run, node, state)
+        run.__name__ = f"async_{node.__name__}"
+        return run
+
+    def candidate_difficulties(self, state: InterviewState) -> list[str]:
+        """Difficulties decide_next can move to from the current one."""
+        index = self.difficulty_levels.index(state.get("current_difficulty", "easy"))
+        candidates = [
+            self.difficulty_levels[max(0, index - 1)],
+            self.difficulty_levels[index],
+            self.difficulty_levels[min(len(self.difficulty_levels) - 1, index + 1)]
+        ]
+        return list(dict.fromkeys(candidates))
+
+    def start_prefetch(self, state: InterviewState):
+        """Start generating candidate next questions in the background."""
+        if not self.prefetch or state.get("question_count", 0) >= self.max_questions:
+            return
+        topic = state["topic"]
+        history = history_for_prompt(state.get("history", []))
+        with self.prefetch_lock:
+            self.prefetch_prompts.clear()
+            self.promoted.clear()
+        for difficulty in self.candidate_difficulties(state):
+            if difficulty in self.prefetched or self.spare_questions.get(difficulty):
+                continue
+            self.prefetched[difficulty] = self.executor.submit(
+                contextvars.copy_context().run, self.fetch_question, topic, difficulty, history, "prefetch"
+            )
+            logging.info("Prefetching %s question for %s", difficulty, topic)
+
+    def take_prefetched(self, difficulty: str) -> tuple[dict, str] | None:
+        """Return the prefetched question for difficulty, keeping the other candidates as spares."""
+        future = self.prefetched.pop(difficulty, None)
+        for other, pending in self.prefetched.items():
+            if not pending.cancel():
+                pending.add_done_callback(lambda f, d=other: self.keep_spare(d, f))
+        self.prefetched.clear()
+
+        result = None
+        if future:
+            if not future.done():
+                self.promote_prefetch(difficulty)
+            try:
+                result = future.result()
+            except Exception as e:
+                logging.warning("Prefetch for %s question failed: %s", difficulty, e)
+        if result is None and self.spare_questions.get(difficulty):
+            result = self.spare_questions[difficulty].pop(0)
+        if result and result[0]["question"] in self.used_questions:
+            return None
+        return result
+
+    def promote_prefetch(self, difficulty: str):
+        """The candidate now waits on this prefetch, so stop queueing it behind other sessions' calls."""
+        with self.prefetch_lock:
+            self.promoted.add(difficulty)
+            prompt = self.prefetch_prompts.get(difficulty)
+        if prompt is not None and self.scheduler.promote(prompt, "question"):
+            logging.info("Promoted prefetched %s question to question priority", difficulty)
+
+    def keep_spare(self, difficulty: str, future):
+        if future.cancelled() or future.exception():
+            return
+        self.spare_questions.setdefault(difficulty, []).append(future.result())
+
+    def reset_prefetch(self):
+        for future in self.prefetched.values():
+            future.cancel()
+        self.prefetched.clear()
+        self.spare_questions.clear()
+        with self.prefetch_lock:
+            self.prefetch_prompts.clear()
+            self.promoted.clear()
+
     def generate_question(self, state: InterviewState) -> InterviewState:
-        logging.debug(f"Generating question with state: {state}")
+        logging.debug("Generating question with state: %s", state)
         if state.get("question_count", 0) >= self.max_questions and not state.get("is_follow_up", False):
             state["decision"] = "end"
             logging.info("Max questions reached.")
@@ -71,87 +345,63 @@ class InterviewerAgent:
         if state.get("is_follow_up", False):
             difficulty = max("easy", self.difficulty_levels[max(0, self.difficulty_levels.index(difficulty) - 1)])
 
-        question = self.vector_store.retrieve_question(state["topic"], difficulty)
-        source = "vector_store"
-        if question and question["question"] in self.used_questions:
-            question = None
-        if not question:
-            source = "llm"
-            prompt = question_prompt.format(
-                topic=state["topic"],
-                difficulty=difficulty,
-                history=state.get("history", "")
-            )
-            try:
-                response = self.llm.invoke(prompt)
-                question_text = response.content.strip()
-                if question_text.startswith("```json\n") and question_text.endswith("\n```"):
-                    question_text = question_text[8:-4]
-                question = json.loads(question_text)
-                if question["question"] in self.used_questions:
-                    question = {
-                        "question": f"Explain a {difficulty} concept in {state['topic']}.",
-                        "answer_key": f"Provide a detailed explanation of a {difficulty} concept in {state['topic']}.",
-                        "difficulty": difficulty
-                    }
-            except json.JSONDecodeError:
-                question = {
-                    "question": f"Explain a {difficulty} concept in {state['topic']}.",
-                    "answer_key": f"Provide a detailed explanation of a {difficulty} concept in {state['topic']}.",
-                    "difficulty": difficulty
-                }
+        prefetched = self.take_prefetched(difficulty) if self.prefetch else None
+        if prefetched:
+            question, source = prefetched
+            source = f"prefetch/{source}"
+        else:
+            question, source = self.fetch_question(state["topic"], difficulty, history_for_prompt(state.get("history", [])))
 
         self.used_questions.add(question["question"])
         if not state.get("is_follow_up", False):
             state["questions"].append(question)
             state["question_count"] = state.get("question_count", 0) + 1
             state["hint_count"] = 0
-        state["history"] = state.get("history", "") + f"Question: {question['question']}\n"
+        add_entry(state, "question", question["question"])
         state["current_question"] = question
         state["is_follow_up"] = False
         state["current_answer"] = ""
-        logging.info(f"Generated question (source: {source}, difficulty: {difficulty}): {question['question']}")
-        print(f"\nQuestion {state['question_count']}: {question['question']}")
+        log_event(
+            "question", "Generated question (source: %s, difficulty: %s): %s", source, difficulty, question["question"],
+            number=state["question_count"], source=source, difficulty=difficulty
+        )
+        self.output(f"\nQuestion {state['question_count']}: {question['question']}")
         return state
 
     def collect_answer(self, state: InterviewState) -> InterviewState:
-        logging.debug(f"Collecting answer with state: {state}")
-        answer = input("Your answer: ").strip()
+        logging.debug("Collecting answer with state: %s", state)
+        answer = self.answers.answer(state["current_question"]["question"], state.get("is_follow_up", False))
+        return self.record_answer(state, answer.strip())
+
+    def collect_submitted_answer(self, state: InterviewState) -> InterviewState:
+        """Headless collect_answer: the answer was written to current_answer before resuming."""
+        return self.record_answer(state, state.get("current_answer", "").strip())
+
+    def record_answer(self, state: InterviewState, answer: str) -> InterviewState:
         is_follow_up = state.get("is_follow_up", False)
         if is_follow_up:
             state["follow_up_answers"].append(answer)
         else:
             state["answers"].append(answer)
-        state["history"] = state.get("history", "") + f"Answer: {answer}\n"
+        add_entry(state, "answer", answer)
         state["current_answer"] = answer
-        logging.info(f"Collected answer for question {state['question_count']}{' (follow-up)' if is_follow_up else ''}: {answer}")
+        log_event(
+            "answer", "Collected answer for question %d%s (%d chars)", state["question_count"],
+            " (follow-up)" if is_follow_up else "", len(answer),
+            payload=answer, number=state["question_count"], follow_up=is_follow_up, chars=len(answer)
+        )
         return state
 
     def evaluate_answer(self, state: InterviewState) -> InterviewState:
-        logging.debug(f"Evaluating answer with state: {state}")
+        logging.debug("Evaluating answer with state: %s", state)
+        self.start_prefetch(state)
         if not state["current_answer"]:
             evaluation = {
                 "score": 0,
                 "feedback": "No answer provided for the question."
             }
         else:
-            prompt = evaluation_prompt.format(
-                question=state["current_question"]["question"],
-                answer_key=state["current_question"]["answer_key"],
-                user_answer=state["current_answer"]
-            )
-            try:
-                response = self.llm.invoke(prompt)
-                response_text = response.content.strip()
-                logging.info(f"Evaluation LLM response: {response_text}")
-                if response_text.startswith("```json\n") and response_text.endswith("\n```"):
-                    response_text = response_text[8:-4]
-                evaluation = json.loads(response_text)
-            except json.JSONDecodeError:
-                evaluation = {
-                    "score": 0,
-                    "feedback": "Unable to evaluate answer due to formatting issue. Please ensure your answer addresses the question clearly."
-                }
+            evaluation = self.score_answer(state)
         is_follow_up = state.get("is_follow_up", False)
         if is_follow_up:
             state["follow_up_scores"].append(evaluation["score"])
@@ -159,11 +409,45 @@ class InterviewerAgent:
         else:
             state["scores"].append(evaluation["score"])
             state["feedbacks"].append(evaluation["feedback"])
-        logging.info(f"Evaluation for question {state['question_count']}{' (follow-up)' if is_follow_up else ''}: Score={evaluation['score']}, Feedback={evaluation['feedback']}")
+        log_event(
+            "evaluation", "Evaluation for question %d%s: Score=%s", state["question_count"],
+            " (follow-up)" if is_follow_up else "", evaluation["score"],
+            payload=evaluation["feedback"], number=state["question_count"], follow_up=is_follow_up, score=evaluation["score"]
+        )
         return state
 
+    def score_answer(self, state: InterviewState) -> dict:
+        """Evaluate the current answer, short-circuiting trivial answers with the pre-scorer."""
+        assessment = None
+        if self.prescore:
+            # Placeholder answer keys (fallback and follow-up questions) say nothing
+            # about a good answer, so only the lexical rule applies to them.
+            question = state["current_question"]
+            placeholder = question.get("placeholder_key", False) or state.get("is_follow_up", False)
+            assessment = self.pre_scorer.assess(state["current_answer"], None if placeholder else question["answer_key"])
+            if assessment["evaluation"] is not None and not self.pre_scorer.shadow():
+                self.pre_scorer.record(assessment, None)
+                return assessment["evaluation"]
+        prompt = evaluation_prompt.format(
+            question=state["current_question"]["question"],
+            answer_key=state["current_question"]["answer_key"],
+            user_answer=state["current_answer"]
+        )
+        evaluation, _ = self.request_json("evaluation", prompt)
+        if assessment is not None:
+            self.pre_scorer.record(assessment, evaluation)
+            if evaluation is None and assessment["evaluation"] is not None:
+                # A shadowed answer whose LLM check failed keeps its pre-score.
+                return assessment["evaluation"]
+        if evaluation is None:
+            evaluation = {
+                "score": 0,
+                "feedback": "Unable to evaluate answer due to formatting issue. Please ensure your answer addresses the question clearly."
+            }
+        return evaluation
+
     def generate_hint(self, state: InterviewState) -> InterviewState:
-        logging.debug(f"Generating hint with state: {state}")
+        logging.debug("Generating hint with state: %s", state)
         if state.get("hint_count", 0) >= self.max_hints:
             state["decision"] = "continue"
             state["hint_count"] = 0
@@ -177,14 +461,11 @@ class InterviewerAgent:
             user_answer=state["current_answer"],
             feedback=state["feedbacks"][-1] if state["feedbacks"] else "No feedback available."
         )
-        try:
-            response = self.llm.invoke(prompt)
-            response_text = response.content.strip()
-            logging.info(f"Hint LLM response: {response_text}")
-            if response_text.startswith("```json\n") and response_text.endswith("\n```"):
-                response_text = response_text[8:-4]
-            hint_data = json.loads(response_text)
-        except json.JSONDecodeError:
+        hint_data, streamed = self.request_json(
+            "hint", prompt, stream_field="content",
+            label=lambda text: "Follow-up Question" if (partial_json_string(text, "type") or "").startswith("follow") else "Hint"
+        )
+        if hint_data is None:
             hint_data = {
                 "type": "hint",
                 "content": "Please consider the key concepts related to the question and provide more detail."
@@ -193,78 +474,113 @@ class InterviewerAgent:
         state["hint_count"] = state.get("hint_count", 0) + 1
         state["current_answer"] = ""
         if hint_data["type"] == "hint":
-            print(f"\nHint: {hint_data['content']}")
-            state["history"] = state.get("history", "") + f"Hint: {hint_data['content']}\n"
+            if not streamed:
+                self.output(f"\nHint: {hint_data['content']}")
+            add_entry(state, "hint", hint_data["content"])
         else:
             state["current_question"] = {
                 "question": hint_data["content"],
                 "answer_key": "Provide a clear answer to the follow-up question.",
-                "difficulty": "easy"
+                "difficulty": "easy",
+                "placeholder_key": True
             }
             state["is_follow_up"] = True
-            state["history"] = state.get("history", "") + f"Follow-up Question: {hint_data['content']}\n"
-            print(f"\nFollow-up Question: {hint_data['content']}")
+            add_entry(state, "follow_up", hint_data["content"])
+            if not streamed:
+                self.output(f"\nFollow-up Question: {hint_data['content']}")
         
-        logging.info(f"Generated {hint_data['type']} for question {state['question_count']}: {hint_data['content']}")
+        log_event(
+            "hint", "Generated %s for question %d", hint_data["type"], state["question_count"],
+            payload=hint_data["content"], number=state["question_count"], type=hint_data["type"]
+        )
         return state
 
-    def generate_feedback(self, state: InterviewState) -> InterviewState:
-        logging.debug(f"Generating feedback with state: {state}")
-        # Generate weights
+    def weights_from_llm(self, state: InterviewState) -> list[float]:
         questions_json = json.dumps([q["question"] for q in state["questions"]])
         prompt = weight_prompt.format(
             topic=state["topic"],
             questions=questions_json
         )
-        try:
-            response = self.llm.invoke(prompt)
-            response_text = response.content.strip()
-            logging.info(f"Weights LLM response: {response_text}")
-            if response_text.startswith("```json\n") and response_text.endswith("\n```"):
-                response_text = response_text[8:-4]
-            weights_data = json.loads(response_text)
-            weights = weights_data["weights"]
-            if len(weights) != len(state["questions"]) or abs(sum(weights) - 1.0) > 0.01:
-                weights = [1.0 / len(state["questions"]) for _ in state["questions"]]
-        except (json.JSONDecodeError, KeyError):
+        weights_data, _ = self.request_json("weights", prompt)
+        weights = weights_data["weights"] if weights_data else []
+        if (
+            len(weights) != len(state["questions"])
+            or not all(isinstance(w, (int, float)) for w in weights)
+            or abs(sum(weights) - 1.0) > 0.01
+        ):
             weights = [1.0 / len(state["questions"]) for _ in state["questions"]]
-        
-        # Generate feedback
+        return weights
+
+    def weights_from_difficulty(self, state: InterviewState) -> list[float]:
+        """Weight questions by their stored difficulty without an LLM call."""
+        raw = [self.difficulty_weights.get(q.get("difficulty"), 1.0) for q in state["questions"]]
+        return [w / sum(raw) for w in raw]
+
+    def summarize(self, state: InterviewState) -> tuple[dict, bool]:
         prompt = feedback_prompt.format(
             scores=state["scores"],
             feedbacks=state["feedbacks"]
         )
-        try:
-            response = self.llm.invoke(prompt)
-            response_text = response.content.strip()
-            logging.info(f"Feedback LLM response: {response_text}")
-            if response_text.startswith("```json\n") and response_text.endswith("\n```"):
-                response_text = response_text[8:-4]
-            feedback = json.loads(response_text)
-        except json.JSONDecodeError:
+        feedback, streamed = self.request_json("feedback", prompt, stream_field="summary", label=lambda text: "Summary")
+        if feedback is None:
             feedback = {
                 "summary": "Unable to generate summary due to formatting issue."
             }
-        
+        return feedback, streamed
+
+    def wait_for(self, future, name: str, default):
+        """Wait up to call_timeout seconds for a background LLM call, falling back to default."""
+        try:
+            return future.result(timeout=self.call_timeout)
+        except TimeoutError:
+            logging.warning("%s call timed out after %ss", name, self.call_timeout)
+        except Exception as e:
+            logging.warning("%s call failed: %s", name, e)
+        future.cancel()
+        return default
+
+    def generate_feedback(self, state: InterviewState) -> InterviewState:
+        logging.debug("Generating feedback with state: %s", state)
+        # Weights and summary are independent, so they are requested concurrently.
+        executor = resources.get_executor()
+        equal_weights = [1.0 / len(state["questions"]) for _ in state["questions"]]
+        weights_future = None if self.local_weights else executor.submit(contextvars.copy_context().run, self.weights_from_llm, state)
+
+        if self.stream:
+            # Streamed tokens have to be rendered from this thread (e.g. Streamlit).
+            self.output("\n=== Interview Summary ===")
+            feedback, streamed = self.summarize(state)
+        else:
+            feedback, streamed = self.wait_for(
+                executor.submit(contextvars.copy_context().run, self.summarize, state), "Summary",
+                ({"summary": "Unable to generate summary in time."}, False)
+            )
+        if weights_future is None:
+            weights = self.weights_from_difficulty(state)
+        else:
+            weights = self.wait_for(weights_future, "Weights", equal_weights)
+
         # Compute weighted final score
         final_score = sum(s * w for s, w in zip(state["scores"], weights))
         
-        print("\n=== Interview Summary ===")
-        print(f"Final Interview Score: {final_score:.1f}/10")
+        if not self.stream:
+            self.output("\n=== Interview Summary ===")
+        self.output(f"Final Interview Score: {final_score:.1f}/10")
         for i, (question, answer, score, feedback_text, weight) in enumerate(zip(
             state["questions"], state["answers"], state["scores"], state["feedbacks"], weights
         )):
-            print(f"\nQuestion {i + 1}: {question['question']}")
-            print(f"Answer: {answer}")
-            print(f"Score: {score}/10")
-            print(f"Weight: {weight:.2f}")
-            print(f"Feedback: {feedback_text}")
+            self.output(f"\nQuestion {i + 1}: {question['question']}")
+            self.output(f"Answer: {answer}")
+            self.output(f"Score: {score}/10")
+            self.output(f"Weight: {weight:.2f}")
+            self.output(f"Feedback: {feedback_text}")
             if i < len(state.get("follow_up_answers", [])):
-                print(f"Follow-up Answer: {state['follow_up_answers'][i]}")
-                print(f"Follow-up Score: {state['follow_up_scores'][i]}/10")
-                print(f"Follow-up Feedback: {state['follow_up_feedbacks'][i]}")
-        
-        print(f"\nSummary: {feedback['summary']}")
+                self.output(f"Follow-up Answer: {state['follow_up_answers'][i]}")
+                self.output(f"Follow-up Score: {state['follow_up_scores'][i]}/10")
+                self.output(f"Follow-up Feedback: {state['follow_up_feedbacks'][i]}")
+
+        if not streamed:
+            self.output(f"\nSummary: {feedback['summary']}")
         state["feedback"] = {
             "summary": feedback["summary"],
             "final_score": final_score,
@@ -273,46 +589,22 @@ class InterviewerAgent:
             "follow_up_scores": state.get("follow_up_scores", []),
             "follow_up_feedbacks": state.get("follow_up_feedbacks", [])
         }
-        logging.info(f"Summary: Final Score={final_score:.1f}, Weights={weights}, Summary={feedback['summary']}")
-        self.save_interview_output(state)
+        log_event(
+            "summary", "Summary: Final Score=%.1f, Weights=%s", final_score, str(weights),
+            payload=feedback["summary"], final_score=final_score, weights=list(weights)
+        )
+        if self.llm_cache is not None:
+            logging.info("LLM cache stats: %s", self.llm_cache.stats())
+        logging.info("LLM decode stats: %s", self.decoder.stats())
+        logging.info("LLM scheduler stats: %s", self.scheduler.stats())
+        self.save_results(state)
         return state
 
-    def save_interview_output(self, state: InterviewState):
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_dir = Path("output")
-        output_dir.mkdir(exist_ok=True)
-        output_file = output_dir / f"interview_{timestamp}.md"
-        markdown_content = f"# Interview Summary for {state['topic'].capitalize()} ({timestamp})\n\n"
-        markdown_content += f"**Final Interview Score: {state['feedback']['final_score']:.1f}/10**\n\n"
-        
-        for i, (question, answer, score, feedback, weight) in enumerate(zip(
-            state["questions"], state["answers"], state["scores"], state["feedbacks"], state["feedback"]["weights"]
-        )):
-            markdown_content += (
-                f"## Question {i + 1}\n"
-                f"**Question**: {question['question']} ({question['difficulty'].capitalize()})\n"
-                f"**Answer**: {answer}\n"
-                f"**Score**: {score}/10\n"
-                f"**Weight**: {weight:.2f}\n"
-                f"**Feedback**: {feedback}\n"
-            )
-            if i < len(state.get("follow_up_answers", [])):
-                markdown_content += (
-                    f"**Follow-up Answer**: {state['follow_up_answers'][i]}\n"
-                    f"**Follow-up Score**: {state['follow_up_scores'][i]}/10\n"
-                    f"**Follow-up Feedback**: {state['follow_up_feedbacks'][i]}\n\n"
-                )
-            else:
-                markdown_content += "\n"
-        
-        markdown_content += (
-            f"## Final Summary\n"
-            f"**Summary**: {state['feedback']['summary']}\n"
-        )
-        
-        with output_file.open("w", encoding="utf-8") as f:
-            f.write(markdown_content)
-        logging.info(f"Saved interview output to {output_file}")
+    def save_results(self, state: InterviewState):
+        """Store the finished interview in the results store (export with results.py)."""
+        interview_id = resources.get_results_store().save(state, session_id=session_id_var.get())
+        state["feedback"]["interview_id"] = interview_id
+        log_event("results_saved", "Saved interview results as %s", interview_id, interview_id=interview_id)
 
 
 
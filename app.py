@@ -1,15 +1,36 @@
 import streamlit as st 
 from agents.agent import InterviewerAgent
-from datetime import datetime
-from pathlib import Path
-import logging
+from utils import resources
+import uuid
+from utils.event_log import configure_logging, set_session_id
+from utils.results_store import render_markdown
+from utils.topic_resolver import TOPIC_ERROR, valid_topic
 
 # Configure logging
-logging.basicConfig(filename="interview.log", level=logging.INFO, format="%(asctime)s - %(message)s")
+configure_logging()
+
+# Load the embedder, vector store and LLM client while the user types a topic
+resources.warm_up()
+
+def streamlit_token_sink():
+    """Render streamed hint, follow-up and summary tokens into a placeholder."""
+    placeholder = st.empty()
+    streamed = {"label": "", "text": ""}
+
+    def sink(event, text):
+        if event == "start":
+            streamed["label"] = text
+        elif event == "token":
+            streamed["text"] += text
+            placeholder.markdown(f"**Interviewer**: {streamed['label']}: {streamed['text']}")
+    return sink
 
 # Initialize session state
+if "session_id" not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
+set_session_id(st.session_state.session_id)
 if "agent" not in st.session_state:
-    st.session_state.agent = InterviewerAgent()
+    st.session_state.agent = InterviewerAgent(prefetch=True, stream=True)
 if "state" not in st.session_state:
     st.session_state.state = None
 if "chat_history" not in st.session_state:
@@ -28,7 +49,7 @@ st.markdown("Welcome! I'm your AI interviewer. Let's start a technical interview
 if not st.session_state.state:
     topic = st.text_input("🎯 Enter a technical topic (e.g., Python, Machine Learning):", key="topic_input")
     if st.button("Start Interview 🚀"):
-        if topic and len(topic.strip()) >= 3:
+        if topic and valid_topic(topic):
             new_state = {
                 "topic": topic.strip(),
                 "question_count": 0,
@@ -36,7 +57,7 @@ if not st.session_state.state:
                 "answers": [],
                 "scores": [],
                 "feedbacks": [],
-                "history": "",
+                "history": [],
                 "current_question": {},
                 "current_answer": "",
                 "decision": "",
@@ -54,7 +75,7 @@ if not st.session_state.state:
             })
             st.rerun()
         else:
-            st.error("Please enter a valid topic (at least 3 characters).")
+            st.error(TOPIC_ERROR)
 
 # Chat UI
 if st.session_state.state and not st.session_state.summary_displayed:
@@ -77,10 +98,11 @@ if st.session_state.state and not st.session_state.summary_displayed:
             if score >= 7:
                 st.session_state.state["decision"] = "continue"
             elif score < 4:
+                st.session_state.agent.token_sink = streamlit_token_sink()
                 st.session_state.state = st.session_state.agent.generate_hint(st.session_state.state)
-                last_line = st.session_state.state["history"].split("\n")[-2]
-                if "Hint:" in last_line:
-                    st.session_state.chat_history.append({"role": "Interviewer", "content": f"💡 {last_line}"})
+                last_entry = st.session_state.state["history"][-1]
+                if last_entry["kind"] == "hint":
+                    st.session_state.chat_history.append({"role": "Interviewer", "content": f"💡 Hint: {last_entry['text']}"})
                 if st.session_state.state["is_follow_up"]:
                     st.session_state.chat_history.append({
                         "role": "Interviewer",
@@ -99,6 +121,7 @@ if st.session_state.state and not st.session_state.summary_displayed:
             st.rerun()
 
     if st.session_state.state["decision"] == "end":
+        st.session_state.agent.token_sink = streamlit_token_sink()
         st.session_state.state = st.session_state.agent.generate_feedback(st.session_state.state)
         st.session_state.summary_displayed = True
         st.rerun()
@@ -122,18 +145,15 @@ if st.session_state.summary_displayed:
         st.markdown(f"**💬 Feedback**: {fb}")
     st.markdown(f"**🧠 Summary**: {st.session_state.state['feedback']['summary']}")
 
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_path = Path(f"output/interview_{timestamp}.md")
-    with open(output_path, "w", encoding="utf-8") as f:
-        for msg in st.session_state.chat_history:
-            f.write(f"{msg['role']}: {msg['content']}\n\n")
-        f.write(f"\nFinal Score: {st.session_state.state['feedback']['final_score']:.1f}/10\n")
-        f.write(f"Summary: {st.session_state.state['feedback']['summary']}\n")
-
-    with open(output_path, "r", encoding="utf-8") as f:
-        markdown_data = f.read()
+    # Rendered once from the stored result instead of on every rerun.
+    if "summary_markdown" not in st.session_state:
+        interview_id = st.session_state.state["feedback"]["interview_id"]
+        st.session_state.summary_markdown = render_markdown(resources.get_results_store().get(interview_id))
+        st.session_state.summary_file = f"interview_{interview_id}.md"
 
-    st.download_button("📥 Download Interview Summary", data=markdown_data, file_name=output_path.name)
+    st.download_button(
+        "📥 Download Interview Summary", data=st.session_state.summary_markdown, file_name=st.session_state.summary_file
+    )
 
     st.markdown("---")
     st.success("🎉 Thank you for taking the interview! We hope this feedback helps you grow and prepare better. Good luck! 🚀")
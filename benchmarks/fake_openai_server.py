@@ -0,0 +1,115 @@
+"""Local OpenAI-compatible chat completions server backed by FakeLLM.
+
+Point the app at it to run real ChatOpenAI clients (timeouts, hedging,
+streaming) without an API key:
+
+    python benchmarks/fake_openai_server.py --port 8001 --latency 0.5 --slow-rate 0.05 --slow-latency 8
+    LLM_BASE_URL=http://127.0.0.1:8001/v1 python main.py --profile
+
+--slow-rate makes that fraction of responses take --slow-latency seconds
+instead, to reproduce the tail latency of a slow API.
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.fakes import FakeLLM
+from utils.llm_scheduler import estimate_tokens
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    llm = FakeLLM()
+    latency = 0.0
+    slow_rate = 0.0
+    slow_latency = 0.0
+    random = random.Random(0)
+    lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, data):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            self.send_json(200, {"object": "list", "data": [{"id": "fake-llm", "object": "model", "owned_by": "local"}]})
+        else:
+            self.send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self.send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        prompt = "\n".join(str(message.get("content", "")) for message in request.get("messages", []))
+        content = self.llm.respond(prompt)
+        with self.lock:
+            slow = self.random.random() < self.slow_rate
+        time.sleep(self.slow_latency if slow else self.latency)
+
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        base = {"id": completion_id, "created": int(time.time()), "model": request.get("model", "fake-llm")}
+        if not request.get("stream"):
+            self.send_json(200, {
+                **base,
+                "object": "chat.completion",
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": {
+                    "prompt_tokens": estimate_tokens(prompt),
+                    "completion_tokens": estimate_tokens(content),
+                    "total_tokens": estimate_tokens(prompt) + estimate_tokens(content)
+                }
+            })
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        pieces = [{"role": "assistant", "content": ""}] + [{"content": content[i:i + 4]} for i in range(0, len(content), 4)]
+        for delta in pieces:
+            chunk = {**base, "object": "chat.completion.chunk", "choices": [{"index": 0, "delta": delta, "finish_reason": None}]}
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+        chunk = {**base, "object": "chat.completion.chunk", "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+        self.wfile.write(f"data: {json.dumps(chunk)}\n\ndata: [DONE]\n\n".encode("utf-8"))
+        self.wfile.flush()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds before each response")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="Fraction of responses that are slow")
+    parser.add_argument("--slow-latency", type=float, default=10.0, help="Seconds before a slow response")
+    parser.add_argument("--replay", help="Responses recorded with RecordingLLM")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    FakeOpenAIHandler.llm = FakeLLM(replay=args.replay)
+    FakeOpenAIHandler.latency = args.latency
+    FakeOpenAIHandler.slow_rate = args.slow_rate
+    FakeOpenAIHandler.slow_latency = args.slow_latency
+    FakeOpenAIHandler.random = random.Random(args.seed)
+    server = ThreadingHTTPServer((args.host, args.port), FakeOpenAIHandler)
+    server.daemon_threads = True
+    print(f"Fake OpenAI API on http://{args.host}:{args.port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
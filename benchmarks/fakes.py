@@ -0,0 +1,178 @@
+"""Offline stand-ins for ChatOpenAI and the HuggingFace embedder used by the benchmarks.
+
+FakeLLM answers every prompt template with a deterministic, well-formed
+response after a configurable latency, or replays responses recorded from a
+real model with RecordingLLM:
+
+    from utils import resources
+    resources.registry.register("llm", FakeLLM(latency=0.5, replay="benchmarks/recordings.json"))
+
+install_fake_models() does the same for the command line tools' --fake-llm.
+"""
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from pathlib import Path
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+def prompt_key(prompt):
+    return hashlib.sha256(str(prompt).encode("utf-8")).hexdigest()
+
+def stable_int(text):
+    """Deterministic (unlike hash()) integer derived from text."""
+    return int(hashlib.md5(text.encode("utf-8")).hexdigest()[:8], 16)
+
+def fenced(data):
+    return f"```json\n{json.dumps(data)}\n```"
+
+class FakeLLM:
+    """Chat model stand-in exposing invoke(prompt) and stream(prompt).
+
+    latency is the time to first token, per_token the time for each further
+    completion token (about four characters) and jitter a +/- fraction applied to
+    both, drawn from a seeded generator so runs are repeatable.
+    """
+
+    model_name = "fake-llm"
+    temperature = 0.7
+
+    def __init__(self, latency=0.0, per_token=0.0, jitter=0.0, seed=0, replay=None):
+        self.latency = latency
+        self.per_token = per_token
+        self.jitter = jitter
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.recorded = {}
+        if replay:
+            with open(replay, "r") as f:
+                self.recorded = json.load(f)
+        self.calls = 0
+
+    def respond(self, prompt):
+        prompt = str(prompt)
+        recorded = self.recorded.get(prompt_key(prompt))
+        if recorded is not None:
+            return recorded
+        if "Generate a" in prompt and "interview question on" in prompt:
+            difficulty, topic = re.search(r"Generate a (\w+) interview question on (.+?)\. Ensure", prompt).groups()
+            n = stable_int(prompt) % 100000
+            return fenced({
+                "question": f"Explain {topic} concept #{n} ({difficulty}).",
+                "answer_key": f"A {difficulty} explanation of {topic} concept #{n}.",
+                "difficulty": difficulty
+            })
+        if "evaluating a candidate's response" in prompt:
+            answer = re.search(r'evaluate the user\'s answer: "(.*?)"\. Score', prompt, re.S)
+            score = stable_int(answer.group(1) if answer else prompt) % 11
+            return fenced({"score": score, "feedback": f"The answer scored {score} for accuracy, clarity and depth."})
+        if "evaluating candidates' responses" in prompt:
+            items = re.search(r"candidate's answer:\n\s*(\[.*\])\n\s*Evaluate every item", prompt, re.S)
+            evaluations = []
+            # Same scores as the single-answer evaluation above.
+            for item in json.loads(items.group(1)) if items else []:
+                score = stable_int(item["answer"]) % 11
+                evaluations.append({"id": item["id"], "score": score, "feedback": f"The answer scored {score} for accuracy, clarity and depth."})
+            return fenced({"evaluations": evaluations})
+        if "struggled with the question" in prompt:
+            kind = "hint" if stable_int(prompt) % 2 else "follow-up"
+            content = "Think about the core definition first." if kind == "hint" else "Can you define the term in one sentence?"
+            return fenced({"type": kind, "content": content})
+        if "assigning weights" in prompt:
+            questions = re.search(r"Questions: (\[.*?\])\n", prompt, re.S)
+            count = len(json.loads(questions.group(1))) if questions else 5
+            return fenced({"weights": [round(1.0 / count, 6)] * count})
+        if "final feedback" in prompt:
+            return fenced({"summary": "The candidate showed solid fundamentals with room to add depth."})
+        return "{}"
+
+    def delay(self, seconds):
+        if seconds <= 0:
+            return
+        if self.jitter:
+            with self.lock:
+                seconds *= 1 + self.random.uniform(-self.jitter, self.jitter)
+        time.sleep(seconds)
+
+    def invoke(self, prompt):
+        content = self.respond(prompt)
+        with self.lock:
+            self.calls += 1
+        self.delay(self.latency + self.per_token * (len(content) // 4))
+        return AIMessage(content=content)
+
+    def stream(self, prompt):
+        content = self.respond(prompt)
+        with self.lock:
+            self.calls += 1
+        self.delay(self.latency)
+        for i in range(0, len(content), 4):
+            self.delay(self.per_token)
+            yield AIMessageChunk(content=content[i:i + 4])
+
+class RecordingLLM:
+    """Wrap a real chat model and save its responses for FakeLLM(replay=path)."""
+
+    def __init__(self, llm, path):
+        self.llm = llm
+        self.path = Path(path)
+        self.model_name = llm.model_name
+        self.temperature = llm.temperature
+        self.lock = threading.Lock()
+        self.recorded = json.loads(self.path.read_text()) if self.path.exists() else {}
+
+    def save(self, prompt, content):
+        with self.lock:
+            self.recorded[prompt_key(prompt)] = content
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(self.recorded, indent=2))
+
+    def invoke(self, prompt):
+        response = self.llm.invoke(prompt)
+        self.save(prompt, response.content)
+        return response
+
+    def stream(self, prompt):
+        content = ""
+        for chunk in self.llm.stream(prompt):
+            content += chunk.content
+            yield chunk
+        self.save(prompt, content)
+
+class HashEmbeddings(Embeddings):
+    """Deterministic bag-of-words embeddings; no model download and near-zero cost."""
+
+    def __init__(self, dim=384):
+        self.dim = dim
+
+    def embed(self, text):
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for word in re.findall(r"\w+", text.lower()):
+            h = stable_int(word)
+            vector[h % self.dim] += 1.0 if h & 0x100 else -1.0
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    def embed_documents(self, texts):
+        return [self.embed(text) for text in texts]
+
+    def embed_query(self, text):
+        return self.embed(text)
+
+def install_fake_models(latency=0.5, per_token=0.0, seed=0, vector_store=True):
+    """Register FakeLLM and HashEmbeddings in place of the real models, so a tool runs offline.
+
+    With vector_store, also a vector store on its own collection: hash vectors
+    must not be mixed into the one embedded with the real model.
+    """
+    from utils import resources
+    from utils.vector_store import VectorStore
+    resources.registry.register("llm", FakeLLM(latency=latency, per_token=per_token, seed=seed))
+    embedder = HashEmbeddings()
+    resources.registry.register("embedder", embedder)
+    if vector_store:
+        resources.registry.register("vector_store", VectorStore("questions_fake", embedder=embedder))
@@ -0,0 +1,38 @@
+"""Synthetic question banks of any size, in the format of data/questions.json."""
+import json
+import random
+from pathlib import Path
+
+TOPICS = [
+    "Python", "JavaScript", "Data Structures", "Algorithms", "Databases", "Operating Systems",
+    "Networking", "Machine Learning", "System Design", "Cloud Computing"
+]
+DIFFICULTIES = ["easy", "medium", "hard"]
+CONCEPTS = [
+    "caching", "concurrency", "memory management", "indexing", "recursion", "hashing", "scheduling",
+    "serialization", "consistency", "load balancing", "garbage collection", "iterators", "transactions"
+]
+
+def make_question_bank(count, seed=0, topics=TOPICS):
+    """Return count questions spread evenly over topics and difficulties; the same seed gives the same bank."""
+    rng = random.Random(seed)
+    questions = []
+    for i in range(count):
+        topic = topics[i % len(topics)]
+        difficulty = DIFFICULTIES[(i // len(topics)) % len(DIFFICULTIES)]
+        concept = rng.choice(CONCEPTS)
+        questions.append({
+            "id": f"bench{i}",
+            "topic": topic,
+            "question": f"How does {concept} work in {topic}? (variant {i})",
+            "answer_key": f"{concept.capitalize()} in {topic} is explained by its core mechanism and trade-offs ({i}).",
+            "difficulty": difficulty
+        })
+    return questions
+
+def write_question_bank(path, count, seed=0):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(make_question_bank(count, seed), f)
+    return path
@@ -0,0 +1,79 @@
+"""Cold-start benchmark for the CLI (main.py) and Streamlit (app.py) entry points.
+
+Each measurement runs in a fresh interpreter and reports the import time of the
+entry point's modules and the time until the first question is ready.
+
+    python benchmarks/startup.py --topic Python --runs 3
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+CHILD = r"""
+import builtins, json, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+if {entry!r} == "main":
+    import main
+    from agents.agent import InterviewerAgent
+    from workflow.graph import build_graph
+else:
+    import streamlit
+    from agents.agent import InterviewerAgent
+from utils import resources
+imported = time.perf_counter()
+
+if {warm_up!r}:
+    resources.warm_up()
+    time.sleep({think_time!r})
+asked = time.perf_counter()
+agent = InterviewerAgent()
+if {entry!r} == "main":
+    builtins.input = lambda *args: {topic!r}
+    for step in build_graph(agent).stream({{}}, config={{"recursion_limit": 50}}):
+        if "generate_question" in step:
+            break
+else:
+    agent.generate_question({{
+        "topic": {topic!r}, "question_count": 0, "questions": [], "answers": [], "scores": [],
+        "feedbacks": [], "history": [], "current_question": {{}}, "current_answer": "",
+        "decision": "", "current_difficulty": "easy", "is_follow_up": False, "hint_count": 0,
+        "follow_up_answers": [], "follow_up_scores": [], "follow_up_feedbacks": []
+    }})
+done = time.perf_counter()
+print(json.dumps({{"import_s": imported - start, "first_question_s": done - asked}}))
+"""
+
+def measure(entry, topic, warm_up, think_time):
+    code = CHILD.format(root=str(ROOT), entry=entry, topic=topic, warm_up=warm_up, think_time=think_time)
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--topic", default="Python", help="Topic answered at the topic prompt")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--think-time", type=float, default=2.0, help="Seconds the user spends typing a topic in warm-up mode")
+    parser.add_argument("--entry", choices=["main", "app"], action="append", help="Entry points to measure (default: both)")
+    args = parser.parse_args()
+
+    report = {}
+    for entry in args.entry or ["main", "app"]:
+        for warm_up in (False, True):
+            runs = [measure(entry, args.topic, warm_up, args.think_time) for _ in range(args.runs)]
+            report[f"{entry}{'+warm_up' if warm_up else ''}"] = {
+                "import_s": statistics.median(r["import_s"] for r in runs),
+                "first_question_s": statistics.median(r["first_question_s"] for r in runs),
+                "runs": args.runs
+            }
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
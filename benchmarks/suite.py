@@ -0,0 +1,266 @@
+"""Offline benchmark suite: cold start, question bank ingestion, retrieval and full interviews.
+
+The OpenAI model and the embedding model are replaced by the stand-ins in
+benchmarks/fakes.py and the question banks are generated by
+benchmarks/fixtures.py, so no API key or network is needed and results are
+comparable between commits:
+
+    python benchmarks/suite.py --output benchmarks/results/baseline.json
+    python benchmarks/suite.py --compare benchmarks/results/baseline.json
+
+Every latency in the results ends in "_s". --compare prints each one next to
+the baseline and exits with status 1 if any regressed by more than --threshold.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+SUITES = ["cold_start", "ingestion", "graph"]
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return {
+        "count": len(ordered),
+        "mean_s": statistics.fmean(ordered),
+        "p50_s": pick(0.5),
+        "p95_s": pick(0.95),
+        "p99_s": pick(0.99)
+    }
+
+@contextlib.contextmanager
+def workspace(bank_size=None, seed=0):
+    """Run in a temporary directory holding data/questions.json (bank_size synthetic questions)."""
+    from benchmarks.fixtures import write_question_bank
+    previous = os.getcwd()
+    path = Path(tempfile.mkdtemp(prefix="interview-bench-"))
+    (path / "data").mkdir()
+    shutil.copy(ROOT / "data" / "topic_aliases.json", path / "data")
+    if bank_size:
+        write_question_bank(path / "data" / "questions.json", bank_size, seed)
+    os.chdir(path)
+    try:
+        yield path
+    finally:
+        os.chdir(previous)
+        shutil.rmtree(path, ignore_errors=True)
+
+def install_fakes(args):
+    """Replace the shared LLM and embedder with offline stand-ins; returns the fake LLM."""
+    from benchmarks.fakes import FakeLLM, HashEmbeddings
+    from utils import resources
+    resources.registry.clear()
+    llm = FakeLLM(latency=args.llm_latency, per_token=args.llm_per_token, jitter=args.llm_jitter,
+                  seed=args.seed, replay=args.replay)
+    resources.registry.register("llm", llm)
+    resources.registry.register("embedder", HashEmbeddings())
+    random.seed(args.seed)
+    return llm
+
+def child_cold_start(args):
+    """Runs in a fresh interpreter: time imports and the first question."""
+    start = time.perf_counter()
+    from agents.agent import InterviewerAgent
+    from workflow.graph import build_graph
+    imported = time.perf_counter()
+    install_fakes(args)
+    agent = InterviewerAgent(cache=False)
+    agent.output = lambda *args, **kwargs: None
+    agent.generate_question(agent.start_state("Python"))
+    done = time.perf_counter()
+    print(json.dumps({"import_s": imported - start, "first_question_s": done - imported}))
+
+def bench_cold_start(args):
+    """First run ingests the bank into an empty store; second run reuses the persisted store."""
+    results = {}
+    with workspace(args.cold_start_bank, args.seed) as path:
+        for mode in ("empty_store", "persisted_store"):
+            command = [
+                sys.executable, str(Path(__file__).resolve()), "--child-cold-start",
+                "--llm-latency", str(args.llm_latency), "--llm-per-token", str(args.llm_per_token),
+                "--llm-jitter", str(args.llm_jitter), "--seed", str(args.seed)
+            ]
+            if args.replay:
+                command += ["--replay", str(Path(args.replay).resolve())]
+            output = subprocess.run(command, cwd=path, capture_output=True, text=True, check=True).stdout
+            results[mode] = json.loads(output.strip().splitlines()[-1])
+    results["bank_size"] = args.cold_start_bank
+    return results
+
+def bench_retrieval(store, count, seed):
+    from benchmarks.fixtures import CONCEPTS, DIFFICULTIES, TOPICS
+    rng = random.Random(seed)
+    pool, similarity = [], []
+    for i in range(count):
+        topic, difficulty = rng.choice(TOPICS), rng.choice(DIFFICULTIES)
+        # Exclude up to five already-asked questions, as in a live interview.
+        exclude = {q["question"] for q in store.index.get((topic, difficulty), [])[:rng.randrange(6)]}
+        start = time.perf_counter()
+        store.retrieve_question(topic, difficulty, exclude=exclude)
+        pool.append(time.perf_counter() - start)
+        if i % 10 == 0:
+            start = time.perf_counter()
+            store.retrieve_question(topic, difficulty, query=f"{rng.choice(CONCEPTS)} in {topic}", exclude=exclude)
+            similarity.append(time.perf_counter() - start)
+    return {"pool": percentiles(pool), "similarity": percentiles(similarity)}
+
+def bench_ingestion(args):
+    """Ingest banks of each size into an empty store, then time a no-op resync, indexing and retrieval."""
+    from utils import resources
+    from utils.vector_store import VectorStore
+    ingestion, retrieval = {}, {}
+    for size in args.sizes:
+        with workspace(size, args.seed):
+            install_fakes(args)
+            start = time.perf_counter()
+            store = VectorStore(embedder=resources.get_embedder())
+            ingest = time.perf_counter() - start
+            start = time.perf_counter()
+            store.load_questions()
+            resync = time.perf_counter() - start
+            start = time.perf_counter()
+            store.build_index()
+            index = time.perf_counter() - start
+            ingestion[str(size)] = {
+                "questions": size,
+                "ingest_s": ingest,
+                "questions_per_s": size / ingest,
+                "resync_s": resync,
+                "index_s": index
+            }
+            retrieval[str(size)] = bench_retrieval(store, args.retrievals, args.seed)
+            print(f"ingestion {size}: {ingest:.2f}s", file=sys.stderr)
+    return {"ingestion": ingestion, "retrieval": retrieval}
+
+def bench_graph(args):
+    """Full five-question interviews through build_graph with scripted answers."""
+    from agents.agent import InterviewerAgent
+    from utils.answers import ScriptedAnswers
+    from utils.metrics import metrics
+    from workflow.graph import build_graph
+    with workspace(args.graph_bank, args.seed):
+        llm = install_fakes(args)
+        metrics.reset()
+        durations = []
+        for run in range(args.runs):
+            agent = InterviewerAgent(cache=False, prefetch=args.prefetch)
+            agent.output = lambda *args, **kwargs: None
+            agent.answers = ScriptedAnswers("Python", [f"Answer {run}-{i} about caching and trade-offs." for i in range(20)])
+            start = time.perf_counter()
+            for _ in build_graph(agent).stream({}, config={"recursion_limit": 50}):
+                pass
+            durations.append(time.perf_counter() - start)
+        nodes = {
+            h["labels"]["node"]: {"count": h["count"], "p50_s": h["p50"], "p95_s": h["p95"], "p99_s": h["p99"]}
+            for h in metrics.snapshot()["histograms"] if h["name"] == "node_seconds"
+        }
+    return {"interview": percentiles(durations), "llm_calls_per_run": llm.calls / args.runs, "nodes": nodes}
+
+def flatten(results, prefix=""):
+    for key, value in results.items():
+        if isinstance(value, dict):
+            yield from flatten(value, f"{prefix}{key}.")
+        elif key.endswith("_s") and isinstance(value, (int, float)):
+            yield f"{prefix}{key}", value
+
+def compare(current, baseline, threshold, min_delta=0.001):
+    """Print latencies against the baseline; returns the names that regressed."""
+    if current["config"] != baseline.get("config"):
+        print("Note: benchmark configuration differs from the baseline.")
+    base = dict(flatten(baseline["results"]))
+    regressions = []
+    print(f"{'metric':<60}{'base ms':>12}{'now ms':>12}{'change':>9}")
+    for name, value in flatten(current["results"]):
+        old = base.get(name)
+        if old is None:
+            continue
+        change = (value - old) / old if old else 0.0
+        regressed = value - old > min_delta and change > threshold
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<60}{old * 1000:>12.2f}{value * 1000:>12.2f}{change:>+9.1%}{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--suite", choices=SUITES, action="append", help="Suites to run (default: all)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="Question bank sizes to ingest")
+    parser.add_argument("--retrievals", type=int, default=1000, help="retrieve_question calls per bank size")
+    parser.add_argument("--runs", type=int, default=5, help="Five-question interviews to run")
+    parser.add_argument("--prefetch", action="store_true", help="Run interviews with question prefetching")
+    parser.add_argument("--cold-start-bank", type=int, default=1000)
+    parser.add_argument("--graph-bank", type=int, default=1000)
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Fake LLM seconds to first token")
+    parser.add_argument("--llm-per-token", type=float, default=0.0, help="Fake LLM seconds per completion token")
+    parser.add_argument("--llm-jitter", type=float, default=0.0, help="Fake LLM latency jitter as a fraction")
+    parser.add_argument("--replay", help="JSON of responses recorded with benchmarks.fakes.RecordingLLM")
+    parser.add_argument("--backend", choices=["chroma", "numpy"], help="Vector backend (default: VECTOR_BACKEND or chroma)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", help="Baseline results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Relative slowdown reported as a regression")
+    parser.add_argument("--child-cold-start", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child_cold_start:
+        child_cold_start(args)
+        return
+
+    if args.backend:
+        # Read by VectorStore here and in the cold start subprocesses.
+        os.environ["VECTOR_BACKEND"] = args.backend
+    suites = args.suite or SUITES
+    results = {}
+    if "cold_start" in suites:
+        results["cold_start"] = bench_cold_start(args)
+    if "ingestion" in suites:
+        results.update(bench_ingestion(args))
+    if "graph" in suites:
+        results["graph"] = bench_graph(args)
+
+    config = {key: value for key, value in vars(args).items() if key not in ("output", "compare", "threshold", "child_cold_start")}
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform()
+        },
+        "config": config,
+        "results": results
+    }
+    output = Path(args.output or ROOT / "benchmarks" / "results" / f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) above {args.threshold:.0%}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""Simulate many candidates interviewing at once to size a deployment.
+
+Each simulated candidate runs a full interview through the headless
+InterviewServer, waiting a think time drawn from a distribution before every
+answer. The report gives throughput and p50/p95/p99 latency per graph node, per
+LLM call and per candidate turn:
+
+    python loadtest.py --candidates 200 --think-time lognormal:20,0.5 --ramp-up 60
+    python loadtest.py --candidates 50 --fake-llm --llm-latency 0.8 --think-time fixed:0
+
+Think times (seconds): fixed:S, uniform:MIN,MAX, exp:MEAN or lognormal:MEDIAN,SIGMA.
+Answers are scripted (--answers, one per line) or replayed from stored
+interviews (--replay with IDs from results.py list, or exported summary files).
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import random
+import time
+from pathlib import Path
+from dotenv import load_dotenv
+from utils.answers import ReplayAnswers, ScriptedAnswers
+from utils.event_log import configure_logging
+from utils.metrics import metrics
+from workflow.server import InterviewServer
+
+load_dotenv()
+
+DEFAULT_ANSWERS = [
+    "It stores results so repeated work is avoided, trading memory for speed.",
+    "I am not sure, I think it has to do with performance.",
+    "It depends on the workload; the main trade-off is consistency against latency.",
+    "You iterate over the items and keep track of the state in a dictionary."
+]
+
+def parse_think_time(spec):
+    """Return a function drawing a think time in seconds from rng, for a spec like uniform:5,20."""
+    kind, _, params = spec.partition(":")
+    try:
+        values = [float(v) for v in params.split(",")] if params else []
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid think time '{spec}'")
+    if kind == "fixed" and len(values) == 1:
+        return lambda rng: values[0]
+    if kind == "uniform" and len(values) == 2:
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "exp" and len(values) == 1:
+        return lambda rng: rng.expovariate(1 / values[0]) if values[0] > 0 else 0.0
+    if kind == "lognormal" and len(values) == 2:
+        return lambda rng: rng.lognormvariate(math.log(values[0]), values[1])
+    raise argparse.ArgumentTypeError(f"Invalid think time '{spec}', expected e.g. fixed:5, uniform:5,20, exp:10 or lognormal:15,0.5")
+
+class LoadGenerator:
+    def __init__(self, server, make_answers, think_time, seed=0, event_timeout=300):
+        self.server = server
+        self.make_answers = make_answers
+        self.think_time = think_time
+        self.rng = random.Random(seed)
+        self.event_timeout = event_timeout
+        self.completed = 0
+        self.failed = 0
+        self.answers_submitted = 0
+
+    async def candidate(self, index):
+        answers = self.make_answers(index)
+        try:
+            session_id = await self.server.start_interview(answers.topic())
+            waiting_since = time.perf_counter()
+            kind = "first_question"
+            question, is_follow_up = "", False
+            while True:
+                event = await self.server.next_event(session_id, timeout=self.event_timeout)
+                if event["type"] in ("question", "follow_up"):
+                    question, is_follow_up = event["question"], event["type"] == "follow_up"
+                elif event["type"] == "awaiting_answer":
+                    metrics.observe("turn_seconds", time.perf_counter() - waiting_since, kind=kind)
+                    await asyncio.sleep(self.think_time(self.rng))
+                    await self.server.submit_answer(session_id, answers.answer(question, is_follow_up))
+                    self.answers_submitted += 1
+                    waiting_since = time.perf_counter()
+                    kind = "answer"
+                elif event["type"] == "summary":
+                    metrics.observe("turn_seconds", time.perf_counter() - waiting_since, kind="summary")
+                elif event["type"] == "finished":
+                    self.completed += 1
+                    break
+                elif event["type"] == "error":
+                    raise RuntimeError(event["message"])
+            self.server.close_session(session_id)
+        except Exception as e:
+            self.failed += 1
+            logging.warning("Simulated candidate %d failed: %s", index, e)
+
+    async def run(self, candidates, ramp_up=0.0):
+        """Start candidates evenly over ramp_up seconds and wait for all of them."""
+        tasks = []
+        for i in range(candidates):
+            tasks.append(asyncio.create_task(self.candidate(i)))
+            if ramp_up and i < candidates - 1:
+                await asyncio.sleep(ramp_up / candidates)
+        await asyncio.gather(*tasks)
+
+def answer_factory(args):
+    """Return a function giving each candidate its own answer provider."""
+    if args.replay:
+        # Loaded once up front; each candidate gets a fresh copy of the replay state.
+        replays = [ReplayAnswers.load(source) for source in args.replay]
+        def make(i):
+            replay = replays[i % len(replays)]
+            return ReplayAnswers(replay.topic_name, replay.records, replay.default)
+        return make
+    answers = DEFAULT_ANSWERS
+    if args.answers:
+        answers = [line.strip() for line in Path(args.answers).read_text(encoding="utf-8").splitlines() if line.strip()]
+    # Candidates start at different answers so their scores, hints and follow-ups vary.
+    return lambda i: ScriptedAnswers(
+        args.topics[i % len(args.topics)],
+        [answers[(i + j) % len(answers)] for j in range(20)],
+        default=answers[0]
+    )
+
+async def run(args, think_time):
+    metrics.reset()
+    server = InterviewServer(max_sessions=args.candidates)
+    generator = LoadGenerator(server, answer_factory(args), think_time, seed=args.seed)
+    start = time.perf_counter()
+    try:
+        await generator.run(args.candidates, args.ramp_up)
+    finally:
+        await server.close()
+    elapsed = time.perf_counter() - start
+
+    summary = {
+        "candidates": args.candidates,
+        "completed": generator.completed,
+        "failed": generator.failed,
+        "elapsed_s": elapsed,
+        "interviews_per_min": generator.completed / elapsed * 60,
+        "answers_per_s": generator.answers_submitted / elapsed
+    }
+    print(f"\n{generator.completed}/{args.candidates} interviews completed in {elapsed:.1f}s "
+          f"({summary['interviews_per_min']:.1f}/min, {summary['answers_per_s']:.2f} answers/s, {generator.failed} failed)\n")
+    print(metrics.report())
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump({"summary": summary, "config": vars(args), **metrics.snapshot()}, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=20, help="Number of simulated candidates")
+    parser.add_argument("--topics", nargs="+", default=["Python"], help="Topics, assigned to candidates round-robin")
+    parser.add_argument("--think-time", default="uniform:5,20", help="Think time distribution before each answer")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="Seconds over which candidates are started")
+    parser.add_argument("--answers", help="Text file of scripted answers, one per line")
+    parser.add_argument("--replay", nargs="+", help="Stored interview IDs or exported summary files to replay")
+    parser.add_argument("--fake-llm", action="store_true", help="Run offline with the fake LLM and hash embeddings from benchmarks/fakes.py")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Fake LLM seconds to first token")
+    parser.add_argument("--llm-per-token", type=float, default=0.0, help="Fake LLM seconds per completion token")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the summary and all metrics as JSON")
+    args = parser.parse_args()
+
+    try:
+        think_time = parse_think_time(args.think_time)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+    configure_logging()
+    if args.fake_llm:
+        from benchmarks.fakes import install_fake_models
+        install_fake_models(latency=args.llm_latency, per_token=args.llm_per_token, seed=args.seed)
+    asyncio.run(run(args, think_time))
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,50 @@
 from agents.agent import InterviewerAgent
 from workflow.graph import build_graph, InterviewState
+from utils import resources
+from utils.answers import ReplayAnswers
+from utils.event_log import configure_logging, set_session_id
+from utils.metrics import metrics, METRICS_PATH
+from workflow.checkpoints import sqlite_checkpointer
+import argparse
 import sys
 import subprocess
+import uuid
 
 def main():
+    parser = argparse.ArgumentParser(description="AI Interviewer Agent (CLI)")
+    parser.add_argument("--no-warm-up", action="store_true", help="Load the embedder and LLM client on first use instead of in the background")
+    parser.add_argument("--stream", action="store_true", help="Stream hints, follow-ups and the summary token by token")
+    parser.add_argument("--local-weights", action="store_true", help="Weight questions by difficulty instead of asking the LLM")
+    parser.add_argument("--session-id", help="Checkpoint the interview under this ID; rerun with the same ID to resume it")
+    parser.add_argument("--prefetch", action="store_true", help="Generate candidate next questions while answers are evaluated")
+    parser.add_argument("--no-prescore", action="store_true", help="Send every answer to the LLM for evaluation, including trivial ones")
+    parser.add_argument("--replay", help="Answer with the answers of a stored interview (ID from results.py list) or an exported summary file")
+    parser.add_argument("--profile", action="store_true", help="Print per-node and per-LLM-call latency percentiles and write them to --metrics-file")
+    parser.add_argument("--metrics-file", default=METRICS_PATH, help="Metrics output for --profile (JSON, or Prometheus text if it ends in .prom)")
+    args = parser.parse_args()
+    configure_logging()
+    set_session_id(args.session_id or uuid.uuid4().hex)
+
     print("Welcome to the AI Interviewer Agent!")
     print("==================================")
     print("Hi! I'm your AI interviewer. Let's start the interview process.")
     
-    agent = InterviewerAgent()
-    graph = build_graph(agent)
+    if not args.no_warm_up:
+        # Load the embedder, vector store and LLM client while the user types a topic.
+        resources.warm_up()
+    agent = InterviewerAgent(
+        prefetch=args.prefetch, stream=args.stream, local_weights=args.local_weights, prescore=not args.no_prescore
+    )
+    if args.replay:
+        agent.answers = ReplayAnswers.load(args.replay)
+    config = {"recursion_limit": 50}
+    checkpointer = None
+    if args.session_id:
+        # A checkpoint is saved after every node, so a crashed or interrupted
+        # interview resumes from its last completed step.
+        checkpointer = sqlite_checkpointer()
+        config["configurable"] = {"thread_id": args.session_id}
+    graph = build_graph(agent, checkpointer=checkpointer)
     
     state: InterviewState = {
         "topic": "",
@@ -18,7 +53,7 @@ def main():
         "answers": [],
         "scores": [],
         "feedbacks": [],
-        "history": "",
+        "history": [],
         "current_question": {},
         "current_answer": "",
         "decision": "",
@@ -27,12 +62,30 @@ def main():
         "hint_count": 0
     }
     
+    if checkpointer:
+        snapshot = graph.get_state(config)
+        if snapshot.values and not snapshot.next:
+            print(f"Interview {args.session_id} has already finished.")
+            return
+        if snapshot.next:
+            agent.restore(snapshot.values)
+            print(f"Resuming interview {args.session_id}.")
+            if "collect_answer" in snapshot.next:
+                print(f"\nQuestion {snapshot.values['question_count']}: {snapshot.values['current_question']['question']}")
+            state = None
+
     try:
-        for _ in graph.stream(state, config={"recursion_limit": 50}):
+        for _ in graph.stream(state, config=config):
             pass
     except KeyboardInterrupt:
         print("\nInterview terminated by user.")
         exit(0)
+    finally:
+        if args.profile:
+            print("\n=== Profile ===")
+            print(metrics.report())
+            metrics.write(args.metrics_file)
+            print(f"Metrics written to {args.metrics_file}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,151 @@
+"""Pre-generate interview questions offline and store them in the vector store.
+
+Live interviews fall back to LLM generation when the bank has no unused
+question for a topic/difficulty. This command fills those pools ahead of time:
+
+    python pregenerate.py --topics Python "Data Structures" --target easy=10 medium=10 hard=5
+
+Progress is recorded in a JSON file, so an interrupted run can be restarted
+with the same arguments and only generates what is still missing.
+"""
+import argparse
+import hashlib
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from dotenv import load_dotenv
+from prompts.templates import question_prompt
+from utils import resources
+from utils.event_log import configure_logging
+from utils.llm_decoder import DecodeError
+
+load_dotenv()
+
+def normalize(text):
+    return " ".join(text.lower().split())
+
+def question_id(topic, question):
+    digest = hashlib.sha256(normalize(f"{topic}\x00{question}").encode("utf-8")).hexdigest()
+    return f"gen-{digest[:16]}"
+
+def parse_targets(values):
+    targets = {}
+    for value in values:
+        difficulty, _, count = value.partition("=")
+        if difficulty not in ("easy", "medium", "hard") or not count.isdigit():
+            raise argparse.ArgumentTypeError(f"Invalid target '{value}', expected e.g. easy=10")
+        targets[difficulty] = int(count)
+    return targets
+
+def generate_one(scheduler, topic, difficulty, history):
+    """Generate and validate a single question, or return None."""
+    prompt = question_prompt.format(topic=topic, difficulty=difficulty, history=history)
+    # Identical prompts are sent on purpose here, so they must not be coalesced.
+    response = scheduler.invoke(prompt, "prefetch", coalesce=False, route="question")
+    try:
+        question = resources.get_decoder().decode("question", response.content)
+    except DecodeError:
+        return None
+    text = question["question"].strip()
+    answer_key = question["answer_key"].strip()
+    if len(text) < 10 or not answer_key:
+        return None
+    return {
+        "id": question_id(topic, text),
+        "topic": topic,
+        "question": text,
+        "answer_key": answer_key,
+        "difficulty": difficulty
+    }
+
+class Pregenerator:
+    def __init__(self, progress_path, concurrency=4, max_attempts_factor=3):
+        self.vector_store = resources.get_vector_store()
+        self.scheduler = resources.get_scheduler()
+        self.concurrency = concurrency
+        self.max_attempts_factor = max_attempts_factor
+        self.progress_path = Path(progress_path)
+        self.progress = self.load_progress()
+
+    def load_progress(self):
+        if self.progress_path.exists():
+            with open(self.progress_path, "r") as f:
+                return json.load(f)
+        return {}
+
+    def save_progress(self):
+        self.progress_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.progress_path, "w") as f:
+            json.dump(self.progress, f, indent=2)
+
+    def fill(self, topic, difficulty, target):
+        """Generate questions until the (topic, difficulty) pool holds target questions."""
+        cell = f"{topic}/{difficulty}"
+        pool = list(self.vector_store.index.get((topic, difficulty), []))
+        seen = {normalize(q["question"]) for q in pool}
+        missing = target - len(pool)
+        if missing <= 0:
+            self.progress[cell] = {"target": target, "stored": len(pool), "done": True}
+            self.save_progress()
+            print(f"{cell}: {len(pool)}/{target} already stored")
+            return
+
+        generated = []
+        attempts = 0
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            while len(generated) < missing and attempts < missing * self.max_attempts_factor:
+                batch = min(self.concurrency, missing - len(generated))
+                history = " | ".join(q["question"] for q in pool[-20:] + generated[-20:])
+                futures = [executor.submit(generate_one, self.scheduler, topic, difficulty, history) for _ in range(batch)]
+                attempts += batch
+                accepted = []
+                for future in as_completed(futures):
+                    try:
+                        question = future.result()
+                    except Exception as e:
+                        logging.warning("Question generation failed for %s: %s", cell, e)
+                        continue
+                    if question is None or normalize(question["question"]) in seen:
+                        continue
+                    seen.add(normalize(question["question"]))
+                    accepted.append(question)
+                if accepted:
+                    # Upsert after every round so an interrupted run keeps its progress.
+                    self.vector_store.add_generated_questions(accepted)
+                    generated.extend(accepted)
+                stored = len(pool) + len(generated)
+                self.progress[cell] = {"target": target, "stored": stored, "done": stored >= target}
+                self.save_progress()
+                print(f"{cell}: {stored}/{target} stored ({attempts} generation calls)")
+
+        logging.info("Pre-generated %d questions for %s in %d calls", len(generated), cell, attempts)
+
+    def run(self, topics, targets):
+        for topic in topics:
+            canonical = self.vector_store.resolve_topic(topic) or topic
+            for difficulty, target in targets.items():
+                cell = f"{canonical}/{difficulty}"
+                if self.progress.get(cell, {}).get("done") and self.progress[cell]["target"] >= target:
+                    print(f"{cell}: done in a previous run")
+                    continue
+                self.fill(canonical, difficulty, target)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--topics", nargs="+", required=True, help="Topics to pre-generate questions for")
+    parser.add_argument("--target", nargs="+", default=["easy=10", "medium=10", "hard=10"],
+                        help="Questions wanted per difficulty, e.g. easy=10 medium=10 hard=5")
+    parser.add_argument("--concurrency", type=int, default=4, help="Maximum concurrent LLM calls")
+    parser.add_argument("--progress-file", default="data/pregenerate_progress.json")
+    args = parser.parse_args()
+    configure_logging()
+
+    try:
+        targets = parse_targets(args.target)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+    Pregenerator(args.progress_file, concurrency=args.concurrency).run(args.topics, targets)
+
+if __name__ == "__main__":
+    main()
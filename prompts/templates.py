@@ -38,6 +38,32 @@ evaluation_prompt = PromptTemplate(
     """
 )
 
+# Offline re-grading (regrade.py) packs several answers into one call; the
+# rubric is the same as evaluation_prompt.
+batch_evaluation_prompt = PromptTemplate(
+    input_variables=["items"],
+    template="""You are a technical interviewer evaluating candidates' responses. Each item below is a JSON object with an id, a question, the expected answer and the candidate's answer:
+    {items}
+    Evaluate every item independently; answers of other items must not influence its score. Score each answer (0–10) based on:
+    - Accuracy: Correctness of technical content.
+    - Clarity: Structure and coherence.
+    - Depth: Level of detail and insight.
+    Provide for each item:
+    - Its id.
+    - A score (0–10).
+    - Brief feedback (2–3 sentences) explaining the score.
+    Return the response as a valid JSON object, enclosed in triple backticks:
+    ```json
+    {{
+      "evaluations": [
+        {{"id": "item id", "score": 0, "feedback": "Feedback text here"}}
+      ]
+    }}
+    ```
+    Ensure the output is strictly JSON, with no additional text outside the backticks, and one evaluation per item.
+    """
+)
+
 feedback_prompt = PromptTemplate(
     input_variables=["scores", "feedbacks"],
     template="""You are a technical interviewer providing final feedback after an interview. Based on the scores {scores} and per-question feedback {feedbacks}, summarize the candidate's performance. Highlight:
@@ -87,4 +113,49 @@ weight_prompt = PromptTemplate(
     ```
     Ensure the output is strictly JSON, with no additional text outside the backticks, and the weights sum to 1.0.
     """
-)
\ No newline at end of file
+)
+
+# Cache TTL in seconds per template; None means the template is never cached.
+# Evaluations, hints and summaries depend on the candidate's answers, so they stay uncached.
+cache_ttls = {
+    "question": 7 * 24 * 3600,
+    "weights": 30 * 24 * 3600,
+    "evaluation": None,
+    "batch_evaluation": None,
+    "hint": None,
+    "feedback": None
+}
+
+# Chat model settings per template, i.e. per graph node: question
+# (generate_question), evaluation (evaluate_answer), hint (generate_hint),
+# weights and feedback (generate_feedback). Missing keys come from "default";
+# LLM_ROUTES can point at a JSON file of overrides in the same shape.
+# timeout is the client timeout in seconds. budget is the latency after which
+# a hedged duplicate request is sent: seconds, "p95" of the route's recent
+# calls, or None to never hedge. Streamed calls are not hedged.
+llm_routes = {
+    "default": {"model": "gpt-4o-mini", "temperature": 0.7, "max_tokens": None, "timeout": 30, "budget": "p95"},
+    "evaluation": {"max_tokens": 300, "timeout": 20},
+    "hint": {"max_tokens": 200, "timeout": 15},
+    "weights": {"max_tokens": 100, "timeout": 15},
+    "feedback": {"max_tokens": 400},
+    "batch_evaluation": {"timeout": 120, "budget": None}
+}
+
+# Required keys and types of each template's JSON response.
+response_schemas = {
+    "question": {"question": str, "answer_key": str},
+    "evaluation": {"score": (int, float), "feedback": str},
+    "batch_evaluation": {"evaluations": list},
+    "hint": {"type": str, "content": str},
+    "weights": {"weights": list},
+    "feedback": {"summary": str}
+}
+
+repair_prompt = PromptTemplate(
+    input_variables=["keys", "response"],
+    template="""The following text was supposed to be a single JSON object with the keys {keys}, but it could not be parsed:
+    {response}
+    Return only the corrected JSON object, with no additional text.
+    """
+)
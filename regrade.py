@@ -0,0 +1,238 @@
+"""Re-score stored interviews after a change to evaluation_prompt or the model.
+
+Answers are streamed from the results store and graded again; short answers
+are packed several to a call with batch_evaluation_prompt, long ones keep the
+single-answer evaluation_prompt. New scores are saved next to the old ones
+under a run name (by default the model plus a hash of the evaluation prompts):
+
+    python regrade.py --since 2026-09-01 --batch-size 8 --concurrency 8
+    python regrade.py --run gpt-4o-mini-v2 --topic Python
+
+Each interview is saved as soon as all its answers are graded, so an
+interrupted run can be restarted with the same arguments and only grades what
+is still missing. Only main answers are re-graded; follow-ups do not count
+towards the final score.
+"""
+import argparse
+import contextvars
+import hashlib
+import json
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dotenv import load_dotenv
+from agents.agent import InterviewerAgent
+from prompts.templates import batch_evaluation_prompt, evaluation_prompt
+from utils import resources
+from utils.event_log import configure_logging
+from utils.llm_decoder import DecodeError
+from utils.llm_scheduler import estimate_tokens
+from utils.metrics import metrics
+from utils.results_store import RESULTS_PATH, ResultsStore, parse_date
+
+load_dotenv()
+
+NO_ANSWER = {"score": 0, "feedback": "No answer provided for the question."}
+
+def default_run_name():
+    digest = hashlib.sha256((evaluation_prompt.template + batch_evaluation_prompt.template).encode("utf-8")).hexdigest()
+    return f"{resources.get_llm('evaluation').model_name}-{digest[:8]}"
+
+class Regrader:
+    def __init__(self, store, run, batch_size=8, max_item_tokens=400, concurrency=4):
+        self.store = store
+        self.run_name = run
+        self.batch_size = batch_size
+        # Answers longer than this are graded alone, as in a live interview.
+        self.max_item_tokens = max_item_tokens
+        self.concurrency = concurrency
+        self.scheduler = resources.get_scheduler()
+        self.decoder = resources.get_decoder()
+        self.pending = {}
+        self.calls = 0
+        self.answers = 0
+        self.saved = 0
+        self.failed = 0
+        self.reported = 0
+
+    def items(self, record):
+        """(question, answer_key, answer) triples of one interview's main answers."""
+        return [
+            {
+                "id": f"{record['id']}:{i}",
+                "interview_id": record["id"],
+                "index": i,
+                "question": question["question"],
+                "answer_key": question.get("answer_key", ""),
+                "answer": answer
+            }
+            for i, (question, answer) in enumerate(zip(record["questions"], record["answers"]))
+        ]
+
+    def stream_items(self, filters):
+        done = self.store.regraded_ids(self.run_name)
+        for record in self.store.records(**filters):
+            if record["id"] in done:
+                continue
+            items = self.items(record)
+            self.pending[record["id"]] = {"record": record, "remaining": len(items), "results": {}}
+            if not items:
+                self.finish(record["id"])
+            yield from items
+
+    def batches(self, items):
+        """Pack items into batches of at most batch_size answers and batch_size * max_item_tokens tokens."""
+        batch, tokens = [], 0
+        for item in items:
+            size = estimate_tokens(item["question"] + item["answer_key"] + item["answer"])
+            if size > self.max_item_tokens:
+                yield [item]
+                continue
+            if batch and (len(batch) >= self.batch_size or tokens + size > self.batch_size * self.max_item_tokens):
+                yield batch
+                batch, tokens = [], 0
+            batch.append(item)
+            tokens += size
+        if batch:
+            yield batch
+
+    def invoke(self, template, prompt):
+        response = self.scheduler.invoke(prompt, "regrade", route=template)
+        self.calls += 1
+        InterviewerAgent.record_usage(template, prompt, response)
+        return response
+
+    def grade_one(self, item):
+        if not item["answer"]:
+            return NO_ANSWER
+        prompt = evaluation_prompt.format(question=item["question"], answer_key=item["answer_key"], user_answer=item["answer"])
+        with metrics.span("llm_request", template="evaluation"):
+            response = self.invoke("evaluation", prompt)
+        try:
+            return self.decoder.decode("evaluation", response.content)
+        except DecodeError as e:
+            self.decoder.record(self.decoder.unrecovered, "evaluation")
+            logging.warning("Re-grading %s failed to decode: %s", item["id"], e)
+            return None
+
+    def grade(self, batch):
+        """Return {item id: evaluation or None}; items missing from a batch response are graded alone."""
+        results = {item["id"]: NO_ANSWER for item in batch if not item["answer"]}
+        batch = [item for item in batch if item["answer"]]
+        if len(batch) == 1:
+            results[batch[0]["id"]] = self.grade_one(batch[0])
+            return results
+        if not batch:
+            return results
+        items = json.dumps(
+            [{"id": item["id"], "question": item["question"], "expected_answer": item["answer_key"], "answer": item["answer"]}
+             for item in batch],
+            ensure_ascii=False
+        )
+        prompt = batch_evaluation_prompt.format(items=items)
+        with metrics.span("llm_request", template="batch_evaluation"):
+            response = self.invoke("batch_evaluation", prompt)
+        try:
+            evaluations = self.decoder.decode("batch_evaluation", response.content)["evaluations"]
+        except DecodeError as e:
+            self.decoder.record(self.decoder.failures, "batch_evaluation")
+            logging.warning("Batch of %d answers failed to decode (%s), grading them one by one", len(batch), e)
+            evaluations = []
+        for evaluation in evaluations:
+            if not isinstance(evaluation, dict) or evaluation.get("id") not in {item["id"] for item in batch}:
+                continue
+            score, feedback = evaluation.get("score"), evaluation.get("feedback")
+            if isinstance(score, (int, float)) and not isinstance(score, bool) and 0 <= score <= 10 and isinstance(feedback, str):
+                results[evaluation["id"]] = {"score": score, "feedback": feedback}
+        missing = [item for item in batch if item["id"] not in results]
+        if missing and len(missing) < len(batch):
+            logging.info("Batch response lacked %d of %d answers, grading them one by one", len(missing), len(batch))
+        for item in missing:
+            results[item["id"]] = self.grade_one(item)
+        return results
+
+    def finish(self, interview_id):
+        entry = self.pending.pop(interview_id)
+        record, results = entry["record"], entry["results"]
+        if any(result is None for result in results.values()):
+            # Left out of the run, so a restart grades this interview again.
+            self.failed += 1
+            return
+        indexes = sorted(results)
+        new_scores = [results[i]["score"] for i in indexes]
+        feedbacks = [results[i]["feedback"] for i in indexes]
+        new_final_score = sum(s * w for s, w in zip(new_scores, record["weights"]))
+        self.store.save_regrade(self.run_name, record, new_scores, feedbacks, new_final_score)
+        self.saved += 1
+
+    def collect(self, batch, results):
+        for item in batch:
+            entry = self.pending[item["interview_id"]]
+            entry["results"][item["index"]] = results.get(item["id"])
+            entry["remaining"] -= 1
+            self.answers += 1
+            if entry["remaining"] == 0:
+                self.finish(item["interview_id"])
+
+    def run(self, **filters):
+        """Grade every stored interview matching filters that is not yet in this run."""
+        start = time.perf_counter()
+        futures = {}
+        # Only concurrency batches are in flight, so records are read as they are needed.
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for batch in self.batches(self.stream_items(filters)):
+                while len(futures) >= self.concurrency:
+                    self.drain(futures)
+                futures[executor.submit(contextvars.copy_context().run, self.grade, batch)] = batch
+            while futures:
+                self.drain(futures)
+        elapsed = time.perf_counter() - start
+        logging.info("Re-graded %d answers of %d interviews in %d LLM calls (%.1fs)", self.answers, self.saved, self.calls, elapsed)
+        return elapsed
+
+    def drain(self, futures):
+        """Collect the results of at least one finished batch."""
+        done, _ = wait(futures, return_when=FIRST_COMPLETED)
+        for future in done:
+            batch = futures.pop(future)
+            try:
+                results = future.result()
+            except Exception as e:
+                logging.warning("Re-grading a batch of %d answers failed: %s", len(batch), e)
+                results = {}
+            self.collect(batch, results)
+        if self.saved + self.failed >= self.reported + 50:
+            self.reported = self.saved + self.failed
+            print(f"{self.saved} interviews re-graded, {self.failed} failed ({self.calls} LLM calls)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--run", help="Name the new scores are saved under (default: model and prompt hash)")
+    parser.add_argument("--topic")
+    parser.add_argument("--since", type=parse_date, help="Only interviews on or after this date")
+    parser.add_argument("--until", type=parse_date, help="Only interviews before this date")
+    parser.add_argument("--batch-size", type=int, default=8, help="Answers packed into one LLM call (1 disables packing)")
+    parser.add_argument("--max-item-tokens", type=int, default=400, help="Answers longer than this are graded alone")
+    parser.add_argument("--concurrency", type=int, default=4, help="Maximum concurrent LLM calls")
+    parser.add_argument("--path", default=RESULTS_PATH, help="Results store file")
+    parser.add_argument("--fake-llm", action="store_true", help="Use the offline fake LLM from benchmarks/fakes.py")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Fake LLM seconds per call")
+    args = parser.parse_args()
+    configure_logging()
+    if args.fake_llm:
+        from benchmarks.fakes import install_fake_models
+        # Re-grading only calls the LLM, so no vector store is built.
+        install_fake_models(latency=args.llm_latency, vector_store=False)
+
+    run = args.run or default_run_name()
+    store = ResultsStore(args.path)
+    regrader = Regrader(store, run, batch_size=args.batch_size, max_item_tokens=args.max_item_tokens, concurrency=args.concurrency)
+    elapsed = regrader.run(topic=args.topic, since=args.since, until=args.until)
+    stats = store.regrade_stats(run)
+    print(f"Run {run}: {regrader.answers} answers of {regrader.saved} interviews re-graded in {regrader.calls} LLM calls "
+          f"({elapsed:.1f}s, {regrader.failed} failed)")
+    if stats["interviews"]:
+        print(f"{stats['interviews']} interviews in run, average final score {stats['avg_old_score']:.2f} -> {stats['avg_new_score']:.2f}")
+
+if __name__ == "__main__":
+    main()
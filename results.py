@@ -0,0 +1,69 @@
+"""Browse and export finished interviews from the results store (data/results.sqlite).
+
+    python results.py list --topic Python --since 2026-01-01 --min-score 7
+    python results.py stats --since 2026-01-01
+    python results.py export <id> [--format json] [--output interview.md]
+"""
+import argparse
+import json
+import sys
+from datetime import datetime
+from utils.results_store import RESULTS_PATH, ResultsStore, parse_date, render_markdown
+
+def filters(args):
+    return {
+        "topic": args.topic, "since": args.since, "until": args.until,
+        "min_score": args.min_score, "max_score": args.max_score
+    }
+
+def list_interviews(store, args):
+    rows = store.query(limit=args.limit, offset=args.offset, **filters(args))
+    for row in rows:
+        created = datetime.fromtimestamp(row["created"]).strftime("%Y-%m-%d %H:%M")
+        print(f"{row['id']}  {created}  {row['final_score']:4.1f}/10  {row['question_count']:2d}q  {row['topic']}")
+    if not rows:
+        print("No interviews found.")
+
+def show_stats(store, args):
+    rows = store.stats(**filters(args))
+    print(f"{'topic':<32} {'interviews':>10} {'avg':>6} {'min':>6} {'max':>6}")
+    for row in rows:
+        print(f"{row['topic'][:32]:<32} {row['interviews']:>10} {row['avg_score']:>6.1f} {row['min_score']:>6.1f} {row['max_score']:>6.1f}")
+
+def export(store, args):
+    record = store.get(args.id)
+    if record is None:
+        sys.exit(f"No stored interview '{args.id}'")
+    text = json.dumps(record, indent=2, ensure_ascii=False) if args.format == "json" else render_markdown(record)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+        print(f"Interview written to {args.output}")
+    else:
+        print(text)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--path", default=RESULTS_PATH, help="Results store file")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name in ("list", "stats"):
+        command = commands.add_parser(name)
+        command.add_argument("--topic")
+        command.add_argument("--since", type=parse_date, help="Only interviews on or after this date")
+        command.add_argument("--until", type=parse_date, help="Only interviews before this date")
+        command.add_argument("--min-score", type=float)
+        command.add_argument("--max-score", type=float)
+        if name == "list":
+            command.add_argument("--limit", type=int, default=50)
+            command.add_argument("--offset", type=int, default=0)
+    command = commands.add_parser("export")
+    command.add_argument("id")
+    command.add_argument("--format", choices=["markdown", "json"], default="markdown")
+    command.add_argument("--output", help="Write to this file instead of stdout")
+    args = parser.parse_args()
+
+    store = ResultsStore(args.path)
+    {"list": list_interviews, "stats": show_stats, "export": export}[args.command](store, args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import sqlite3
+from benchmarks.fakes import HashEmbeddings
+from utils.embedding_cache import CachedEmbeddings
+
+class CountingEmbeddings(HashEmbeddings):
+    def __init__(self):
+        super().__init__()
+        self.queries = 0
+
+    def embed_query(self, text):
+        self.queries += 1
+        return super().embed_query(text)
+
+def stored(path):
+    with sqlite3.connect(path) as conn:
+        return {row[0] for row in conn.execute("SELECT text FROM query_embeddings")}
+
+def test_hits_are_served_from_memory(tmp_path):
+    embedder = CountingEmbeddings()
+    cache = CachedEmbeddings(embedder, "test", path=tmp_path / "cache.sqlite")
+    assert cache.embed_query("python") == cache.embed_query("python")
+    assert embedder.queries == 1
+    cache.close()
+
+def test_recently_used_entries_survive_pruning_and_reload(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    cache = CachedEmbeddings(HashEmbeddings(), "test", path=path, max_entries=3, prune_every=2)
+    for text in ("first", "second", "third"):
+        cache.embed_query(text)
+    # A hit makes the oldest entry the most recently used one.
+    cache.embed_query("first")
+    cache.embed_query("fourth")
+    cache.close()
+    assert stored(path) == {"first", "third", "fourth"}
+    reopened = CachedEmbeddings(HashEmbeddings(), "test", path=path, max_entries=3)
+    assert list(reopened.entries) == ["third", "first", "fourth"]
+    reopened.close()
+
+def test_namespaces_are_separate(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    CachedEmbeddings(HashEmbeddings(), "a", path=path).embed_query("python")
+    embedder = CountingEmbeddings()
+    CachedEmbeddings(embedder, "b", path=path).embed_query("python")
+    assert embedder.queries == 1
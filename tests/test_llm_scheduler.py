@@ -0,0 +1,108 @@
+import threading
+import time
+import pytest
+from utils.llm_router import LLMRouter
+from utils.llm_scheduler import LLMScheduler, TokenBucket
+
+class ScriptedClient:
+    """Records prompts in call order; "block" waits for release, delays[prompt] pops one delay per call."""
+
+    def __init__(self, delays=None):
+        self.calls = []
+        self.delays = delays or {}
+        self.release = threading.Event()
+        self.lock = threading.Lock()
+
+    def invoke(self, prompt):
+        with self.lock:
+            self.calls.append(prompt)
+            delays = self.delays.get(prompt)
+            delay = delays.pop(0) if delays else 0
+        if prompt == "block":
+            self.release.wait(5)
+        time.sleep(delay)
+        if prompt == "fail":
+            raise RuntimeError("model error")
+        return f"response to {prompt}"
+
+def make_scheduler(client, routes=None, **kwargs):
+    router = LLMRouter(routes or {"default": {}}, lambda settings: client)
+    return LLMScheduler(router, **kwargs)
+
+def wait_for_calls(client, count):
+    deadline = time.monotonic() + 5
+    while len(client.calls) < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+def test_higher_priority_is_dispatched_first():
+    client = ScriptedClient()
+    scheduler = make_scheduler(client, max_concurrency=1)
+    blocker = scheduler.submit("block", "evaluation")
+    wait_for_calls(client, 1)
+    futures = [scheduler.submit(prompt, priority) for prompt, priority in
+               (("prefetch", "prefetch"), ("hint", "hint"), ("evaluation", "evaluation"))]
+    client.release.set()
+    for future in [blocker] + futures:
+        future.result(5)
+    assert client.calls == ["block", "evaluation", "hint", "prefetch"]
+
+def test_identical_prompts_share_one_call():
+    client = ScriptedClient()
+    scheduler = make_scheduler(client, max_concurrency=1)
+    blocker = scheduler.submit("block")
+    wait_for_calls(client, 1)
+    first = scheduler.submit("same prompt", "prefetch")
+    second = scheduler.submit("same prompt", "question")
+    third = scheduler.submit("same prompt", "question", coalesce=False)
+    client.release.set()
+    blocker.result(5)
+    assert first is second
+    assert first.result(5) == third.result(5) == "response to same prompt"
+    assert client.calls.count("same prompt") == 2
+    assert scheduler.stats()["coalesced"] == 1
+
+def test_promote_moves_a_queued_call_ahead():
+    client = ScriptedClient()
+    scheduler = make_scheduler(client, max_concurrency=1)
+    blocker = scheduler.submit("block")
+    wait_for_calls(client, 1)
+    hint = scheduler.submit("hint", "hint")
+    prefetch = scheduler.submit("prefetch", "prefetch")
+    assert scheduler.promote("prefetch", "question")
+    assert not scheduler.promote("prefetch", "prefetch")
+    assert not scheduler.promote("unknown", "question")
+    client.release.set()
+    for future in (blocker, hint, prefetch):
+        future.result(5)
+    # The stale low-priority entry is skipped, so the prompt is called once.
+    assert client.calls == ["block", "prefetch", "hint"]
+
+def test_slow_call_is_hedged_and_the_faster_response_wins():
+    client = ScriptedClient(delays={"slow": [2.0, 0.0]})
+    scheduler = make_scheduler(client, routes={"default": {"budget": 0.05}})
+    start = time.perf_counter()
+    assert scheduler.invoke("slow") == "response to slow"
+    assert time.perf_counter() - start < 1.0
+    assert client.calls == ["slow", "slow"]
+    stats = scheduler.stats()
+    assert stats["hedges"] == 1 and stats["hedge_wins"] == 1
+
+def test_errors_reach_the_caller():
+    scheduler = make_scheduler(ScriptedClient())
+    with pytest.raises(RuntimeError, match="model error"):
+        scheduler.invoke("fail")
+
+def test_idle_workers_hold_no_request_tokens():
+    scheduler = make_scheduler(ScriptedClient(), requests_per_min=10, max_concurrency=4)
+    time.sleep(0.1)
+    with scheduler.bucket_lock:
+        scheduler.request_bucket.refill()
+        assert scheduler.request_bucket.tokens == 10
+
+def test_refunds_do_not_exceed_capacity():
+    bucket = TokenBucket(10)
+    bucket.take(-5)
+    assert bucket.tokens == 10
+    bucket.take(4)
+    bucket.take(-2)
+    assert bucket.tokens == pytest.approx(8, abs=0.01)
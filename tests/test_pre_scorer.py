@@ -0,0 +1,32 @@
+from benchmarks.fakes import HashEmbeddings
+from utils.pre_scorer import PreScorer
+
+KEY = "Binary search halves the sorted range at every step, so it runs in logarithmic time."
+
+def assess(answer, answer_key=KEY):
+    return PreScorer(HashEmbeddings(), seed=0).assess(answer, answer_key)
+
+def test_explicit_non_answers_score_zero():
+    for answer in ("I don't know", "idk", "pass", "no idea, sorry", "   "):
+        assessment = assess(answer)
+        assert assessment["rule"] == "non_answer", answer
+        assert assessment["evaluation"]["score"] == 0
+
+def test_short_answers_go_to_the_llm():
+    for answer in ("O(log n)", "logarithmic", "yes"):
+        assessment = assess(answer)
+        assert assessment["rule"] is None, answer
+        assert assessment["evaluation"] is None
+
+def test_non_answer_with_content_goes_to_the_llm():
+    assert assess("Not sure, but it halves the sorted range each step")["rule"] is None
+
+def test_answer_key_copy_scores_high():
+    assessment = assess(KEY)
+    assert assessment["rule"] == "answer_key"
+    assert assessment["evaluation"]["score"] == 9
+
+def test_placeholder_key_only_uses_lexical_rule():
+    assert assess("idk", None)["rule"] == "non_answer"
+    assert assess("O(log n)", None)["rule"] is None
+    assert assess("O(log n)", None)["similarity"] is None
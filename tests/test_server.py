@@ -0,0 +1,78 @@
+import asyncio
+import pytest
+from benchmarks.fakes import FakeLLM, HashEmbeddings
+from benchmarks.fixtures import write_question_bank
+from utils import resources
+from workflow.server import InterviewServer
+
+@pytest.fixture
+def offline(tmp_path, monkeypatch):
+    """Fake LLM and embedder, numpy vector store and every data file under tmp_path."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("VECTOR_BACKEND", "numpy")
+    write_question_bank(tmp_path / "data" / "questions.json", 60)
+    resources.registry.clear()
+    resources.registry.register("llm", FakeLLM())
+    resources.registry.register("embedder", HashEmbeddings())
+    yield tmp_path
+    resources.registry.clear()
+
+async def events_until_answer(server, session_id):
+    events = []
+    while not events or events[-1]["type"] not in ("awaiting_answer", "finished", "error"):
+        events.append(await server.next_event(session_id, timeout=30))
+    return events
+
+def evict(server):
+    server.idle_timeout = 0
+    server.evict_idle()
+    server.idle_timeout = 600
+
+def test_reload_replays_question_for_next_event(offline):
+    async def run():
+        server = InterviewServer(checkpoint_path="data/checkpoints.sqlite")
+        try:
+            session_id = await server.start_interview("Python")
+            first = await events_until_answer(server, session_id)
+            evict(server)
+            assert session_id not in server.sessions
+            return first, await events_until_answer(server, session_id)
+        finally:
+            await server.close()
+
+    first, replayed = asyncio.run(run())
+    assert replayed[0]["type"] == "question" and replayed[0]["resumed"]
+    assert replayed[0]["question"] == first[0]["question"]
+    assert replayed[-1]["type"] == "awaiting_answer"
+
+def test_submit_to_evicted_session_does_not_replay_question(offline):
+    async def run():
+        server = InterviewServer(checkpoint_path="data/checkpoints.sqlite")
+        try:
+            session_id = await server.start_interview("Python")
+            await events_until_answer(server, session_id)
+            evict(server)
+            await server.submit_answer(session_id, "I don't know")
+            after = await events_until_answer(server, session_id)
+            # The session must accept the next answer rather than report it is still busy.
+            await server.submit_answer(session_id, "I don't know")
+            return after
+        finally:
+            await server.close()
+
+    after = asyncio.run(run())
+    assert not any(event.get("resumed") for event in after)
+    assert after[0]["type"] == "evaluation"
+    assert after[-1]["type"] == "awaiting_answer"
+
+def test_alias_topic_is_accepted(offline):
+    async def run():
+        server = InterviewServer()
+        try:
+            session_id = await server.start_interview("ML")
+            return await events_until_answer(server, session_id)
+        finally:
+            await server.close()
+
+    events = asyncio.run(run())
+    assert events[0]["type"] == "question"
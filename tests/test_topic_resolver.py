@@ -0,0 +1,56 @@
+import numpy as np
+from utils.topic_resolver import TopicResolver, valid_topic
+
+class StubEmbeddings:
+    """Fixed vectors per text, so similarities are known exactly."""
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+
+    def embed_documents(self, texts):
+        return [self.vectors[text] for text in texts]
+
+    def embed_query(self, text):
+        return self.vectors[text]
+
+VECTORS = {
+    "java": [1.0, 0.0, 0.0],
+    "javascript": [0.0, 1.0, 0.0],
+    "python": [0.0, 0.0, 1.0],
+    # Close to both Java and JavaScript.
+    "java script": [0.7, 0.68, 0.0],
+    "javascript es6": [0.3, 0.95, 0.0],
+    "cooking": [-1.0, 0.0, 0.0]
+}
+
+def make_resolver(tmp_path):
+    return TopicResolver(StubEmbeddings(VECTORS), ["Java", "JavaScript", "Python"], aliases_path=tmp_path / "aliases.json")
+
+def test_exact_name_is_case_insensitive(tmp_path):
+    assert make_resolver(tmp_path).resolve("  JavaScript ") == "JavaScript"
+
+def test_clear_nearest_topic(tmp_path):
+    assert make_resolver(tmp_path).resolve("JavaScript ES6") == "JavaScript"
+
+def test_near_miss_between_two_topics_is_unresolved(tmp_path):
+    resolver = make_resolver(tmp_path)
+    scores = resolver.matrix @ (np.asarray(VECTORS["java script"]) / np.linalg.norm(VECTORS["java script"]))
+    # Above the threshold, so only the margin rejects it.
+    assert scores.max() >= resolver.threshold
+    assert resolver.resolve("Java Script") is None
+
+def test_unrelated_text_is_unresolved(tmp_path):
+    assert make_resolver(tmp_path).resolve("Cooking") is None
+
+def test_aliases_do_not_compete_with_their_topic(tmp_path):
+    (tmp_path / "aliases.json").write_text('{"js": "JavaScript"}')
+    vectors = {**VECTORS, "js": [0.05, 1.0, 0.0]}
+    resolver = TopicResolver(StubEmbeddings(vectors), ["Java", "JavaScript", "Python"], aliases_path=tmp_path / "aliases.json")
+    assert resolver.resolve("JavaScript ES6") == "JavaScript"
+
+def test_two_letter_aliases_are_valid_topics(tmp_path):
+    (tmp_path / "aliases.json").write_text('{"JS": "JavaScript"}')
+    resolver = TopicResolver(StubEmbeddings({**VECTORS, "js": [0.05, 1.0, 0.0]}), ["Java", "JavaScript", "Python"], aliases_path=tmp_path / "aliases.json")
+    assert valid_topic(" JS ")
+    assert resolver.resolve("js") == "JavaScript"
+    assert not valid_topic("J")
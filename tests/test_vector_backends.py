@@ -0,0 +1,51 @@
+import numpy as np
+from benchmarks.fakes import HashEmbeddings
+from utils.vector_backends import NumpyBackend
+
+def add(backend, prefix, count=20):
+    backend.add(
+        [f"{prefix}{i}" for i in range(count)],
+        [f"{prefix} question about topic word{i}" for i in range(count)],
+        [{"topic": "Python", "difficulty": ["easy", "hard"][i % 2]} for i in range(count)]
+    )
+
+def check_consistent(backend):
+    """Every stored row is the embedding of the document with the same position."""
+    embedder = HashEmbeddings()
+    expected = np.asarray(embedder.embed_documents(backend.documents), dtype=np.float32)
+    expected /= np.maximum(np.linalg.norm(expected, axis=1, keepdims=True), 1e-12)
+    assert np.allclose(np.asarray(backend.matrix), expected, atol=1e-6)
+
+def test_search_filters_and_ranks(tmp_path):
+    backend = NumpyBackend("q", HashEmbeddings(), directory=tmp_path)
+    add(backend, "a")
+    backend.flush()
+    results = backend.search("a question about topic word3", 3, {"topic": "Python", "difficulty": "hard"})
+    assert results[0][0] == "a question about topic word3"
+    assert all(metadata["difficulty"] == "hard" for _, metadata, _ in results)
+    assert [distance for _, _, distance in results] == sorted(distance for _, _, distance in results)
+
+def test_processes_flushing_together_do_not_overwrite_each_other(tmp_path):
+    first = NumpyBackend("q", HashEmbeddings(), directory=tmp_path)
+    second = NumpyBackend("q", HashEmbeddings(), directory=tmp_path)
+    add(first, "a")
+    add(second, "b", count=30)
+    first.flush()
+    second.flush()
+    # first still reads the arrays it mapped, second's flush went to new files.
+    check_consistent(first)
+    assert first.search("a question about topic word3", 1, {"topic": "Python"})[0][0] == "a question about topic word3"
+    reopened = NumpyBackend("q", HashEmbeddings(), directory=tmp_path)
+    assert reopened.count() == 30
+    check_consistent(reopened)
+
+def test_flush_keeps_the_previous_version(tmp_path):
+    backend = NumpyBackend("q", HashEmbeddings(), directory=tmp_path)
+    stamps = []
+    for prefix in "abc":
+        add(backend, prefix, count=5)
+        backend.flush()
+        stamps.append(backend.stamp)
+    files = {path.name for path in tmp_path.iterdir()}
+    assert f"q.{stamps[0]}.vectors.npy" not in files
+    assert {f"q.{stamps[1]}.vectors.npy", f"q.{stamps[2]}.vectors.npy"} <= files
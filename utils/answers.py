@@ -0,0 +1,124 @@
+import re
+from pathlib import Path
+from utils.topic_resolver import TOPIC_ERROR, valid_topic
+
+class AnswerProvider:
+    """Source of the candidate's topic and answers for InterviewerAgent.
+
+    Set agent.answers to drive the CLI graph without a keyboard, e.g. from a
+    script, an archived interview or a load generator.
+    """
+
+    def topic(self) -> str:
+        raise NotImplementedError
+
+    def answer(self, question: str, is_follow_up: bool) -> str:
+        raise NotImplementedError
+
+class InteractiveAnswers(AnswerProvider):
+    """Read the topic and answers from the terminal."""
+
+    def __init__(self, output=print):
+        self.output = output
+
+    def topic(self) -> str:
+        topic = input("Enter a technical topic for the interview (e.g., Python, Data Structures): ").strip()
+        while not valid_topic(topic):
+            self.output(TOPIC_ERROR)
+            topic = input("Enter a technical topic: ").strip()
+        return topic
+
+    def answer(self, question: str, is_follow_up: bool) -> str:
+        return input("Your answer: ").strip()
+
+class ScriptedAnswers(AnswerProvider):
+    """Give answers from a list in order, then default once the list runs out."""
+
+    def __init__(self, topic: str, answers: list[str], default: str = ""):
+        self.topic_name = topic
+        self.answers = list(answers)
+        self.default = default
+        self.position = 0
+
+    def topic(self) -> str:
+        return self.topic_name
+
+    def answer(self, question: str, is_follow_up: bool) -> str:
+        if self.position >= len(self.answers):
+            return self.default
+        self.position += 1
+        return self.answers[self.position - 1]
+
+class ReplayAnswers(AnswerProvider):
+    """Replay the answers of an archived interview (stored result or exported markdown summary).
+
+    A question that was asked in the archived interview gets its archived
+    answer (or follow-up answer); any other question gets the next unused
+    archived answer, so replays still work when the bank serves new questions.
+    """
+
+    def __init__(self, topic: str, records: list[dict], default: str = ""):
+        self.topic_name = topic
+        self.records = records
+        self.by_question = {record["question"]: record for record in records}
+        self.default = default
+        self.unused = list(records)
+        self.last = None
+
+    @classmethod
+    def from_markdown(cls, path, default: str = ""):
+        text = Path(path).read_text(encoding="utf-8")
+        title = re.search(r"^# Interview Summary for (.+?) \(\d{8}_\d{6}\)", text, re.M)
+        records = []
+        for block in re.split(r"^## Question \d+\n", text, flags=re.M)[1:]:
+            fields = dict(re.findall(r"^\*\*(.+?)\*\*: ?(.*)$", block, re.M))
+            question = re.sub(r" \((Easy|Medium|Hard)\)$", "", fields.get("Question", ""))
+            records.append({
+                "question": question,
+                "answer": fields.get("Answer", default),
+                "follow_up_answer": fields.get("Follow-up Answer")
+            })
+        return cls(title.group(1) if title else "Python", records, default)
+
+    @classmethod
+    def from_record(cls, record, default: str = ""):
+        """From a results store record (see utils/results_store.py)."""
+        follow_ups = record.get("follow_up_answers", [])
+        records = [
+            {
+                "question": question["question"],
+                "answer": answer,
+                "follow_up_answer": follow_ups[i] if i < len(follow_ups) else None
+            }
+            for i, (question, answer) in enumerate(zip(record["questions"], record["answers"]))
+        ]
+        return cls(record["topic"], records, default)
+
+    @classmethod
+    def load(cls, source, default: str = ""):
+        """From an interview ID in the results store, or a markdown summary path."""
+        if Path(source).is_file():
+            return cls.from_markdown(source, default)
+        from utils import resources
+        record = resources.get_results_store().get(source)
+        if record is None:
+            raise ValueError(f"No stored interview or summary file '{source}'")
+        return cls.from_record(record, default)
+
+    def topic(self) -> str:
+        return self.topic_name
+
+    def answer(self, question: str, is_follow_up: bool) -> str:
+        if is_follow_up:
+            if self.last and self.last.get("follow_up_answer") is not None:
+                return self.last["follow_up_answer"]
+            return self.default
+        record = self.by_question.get(question)
+        if record is None and self.unused:
+            record = self.unused[0]
+        if record is None:
+            return self.default
+        if record in self.unused:
+            self.unused.remove(record)
+        self.last = record
+        return record["answer"]
@@ -0,0 +1,124 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from utils.metrics import metrics
+
+class CachedEmbeddings(Embeddings):
+    """Embedder wrapper that memoizes embed_query in a bounded LRU persisted to SQLite.
+
+    Interviews embed the same few topic and retrieval queries over and over, so
+    repeats are served from memory; the most recent entries are reloaded from
+    disk on startup. namespace identifies the model (and backend), so vectors
+    from different embedders never mix. embed_documents is not cached. Hits
+    refresh last_access, written in batches with the inserts; the table is
+    trimmed to the max_entries most recently used every prune_every inserts
+    and on close().
+    """
+
+    def __init__(self, embedder, namespace, path="data/embedding_cache.sqlite", max_entries=4096, prune_every=256):
+        self.embedder = embedder
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.prune_every = prune_every
+        self.inserts = 0
+        # Hits not yet written to last_access, text -> time.
+        self.accessed = {}
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS query_embeddings (
+                namespace TEXT NOT NULL,
+                text TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                created REAL NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (namespace, text)
+            )"""
+        )
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(query_embeddings)")}
+        if "last_access" not in columns:
+            # Caches written before hits were tracked.
+            self.conn.execute("ALTER TABLE query_embeddings ADD COLUMN last_access REAL NOT NULL DEFAULT 0")
+            self.conn.execute("UPDATE query_embeddings SET last_access = created")
+        self.conn.execute("DROP INDEX IF EXISTS idx_query_embeddings_created")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_query_embeddings_last_access ON query_embeddings (namespace, last_access)")
+        self.conn.commit()
+        rows = self.conn.execute(
+            "SELECT text, vector FROM query_embeddings WHERE namespace = ? ORDER BY last_access DESC LIMIT ?",
+            (namespace, max_entries)
+        ).fetchall()
+        for text, vector in reversed(rows):
+            self.entries[text] = np.frombuffer(vector, dtype=np.float32).tolist()
+
+    def embed_documents(self, texts):
+        return self.embedder.embed_documents(texts)
+
+    def embed_query(self, text):
+        with self.lock:
+            vector = self.entries.get(text)
+            if vector is not None:
+                self.entries.move_to_end(text)
+                self.accessed[text] = time.time()
+                if len(self.accessed) >= self.prune_every and self.conn is not None:
+                    self.write_accessed()
+                    self.conn.commit()
+        if vector is not None:
+            metrics.increment("embedding_cache_total", result="hit")
+            return list(vector)
+
+        metrics.increment("embedding_cache_total", result="miss")
+        array = np.asarray(self.embedder.embed_query(text), dtype=np.float32)
+        # Stored as float32 so memory and disk hits return identical vectors.
+        vector = array.tolist()
+        with self.lock:
+            self.entries[text] = vector
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            if self.conn is None:
+                # Closed at exit while a daemon thread was still embedding.
+                return list(vector)
+            now = time.time()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO query_embeddings (namespace, text, vector, created, last_access) VALUES (?, ?, ?, ?, ?)",
+                (self.namespace, text, array.tobytes(), now, now)
+            )
+            self.inserts += 1
+            if self.inserts % self.prune_every == 0:
+                self.write_accessed()
+                self.prune()
+            self.conn.commit()
+        return list(vector)
+
+    def write_accessed(self):
+        """Store the last_access of hits since the previous call. Needs self.lock."""
+        self.conn.executemany(
+            "UPDATE query_embeddings SET last_access = ? WHERE namespace = ? AND text = ?",
+            [(accessed, self.namespace, text) for text, accessed in self.accessed.items()]
+        )
+        self.accessed.clear()
+
+    def prune(self):
+        """Delete rows used less recently than the newest max_entries of this namespace. Needs self.lock."""
+        self.conn.execute(
+            """DELETE FROM query_embeddings WHERE namespace = ? AND last_access < (
+                SELECT last_access FROM query_embeddings WHERE namespace = ? ORDER BY last_access DESC LIMIT 1 OFFSET ?
+            )""",
+            (self.namespace, self.namespace, self.max_entries - 1)
+        )
+
+    def close(self):
+        with self.lock:
+            if self.conn is None:
+                return
+            self.write_accessed()
+            self.prune()
+            self.conn.commit()
+            self.conn.close()
+            self.conn = None
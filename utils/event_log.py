@@ -0,0 +1,114 @@
+import atexit
+import contextvars
+import json
+import logging
+import os
+import queue
+import random
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+
+LOG_PATH = "interview.log"
+EVENTS_PATH = "logs/events.jsonl"
+# Argument types that cannot change after the call, so formatting them can wait
+# until the record reaches the writer thread.
+IMMUTABLE_ARGS = (str, int, float, bool, type(None))
+
+session_id_var = contextvars.ContextVar("session_id", default=None)
+payload_sample_rate = float(os.getenv("LOG_PAYLOAD_SAMPLE_RATE", "0.1"))
+listener = None
+queue_handler = None
+
+class SessionFilter(logging.Filter):
+    """Stamp each record with the interview session of the calling context."""
+
+    def filter(self, record):
+        record.session_id = session_id_var.get()
+        return True
+
+class BackgroundQueueHandler(QueueHandler):
+    """Hand records to the writer thread without formatting or blocking when possible.
+
+    Records are only formatted on the calling thread when their arguments are
+    mutable (e.g. a state dict). A full queue drops the record instead of
+    stalling the request.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        if (
+            record.exc_info is None
+            and isinstance(record.msg, str)
+            and isinstance(record.args, tuple)
+            and all(isinstance(arg, IMMUTABLE_ARGS) for arg in record.args)
+        ):
+            return record
+        return super().prepare(record)
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: timestamp, level, session, event name, message and event fields."""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "session_id": getattr(record, "session_id", None),
+            "event": getattr(record, "event", None),
+            "message": record.getMessage()
+        }
+        entry.update(getattr(record, "fields", {}))
+        return json.dumps(entry, default=str)
+
+def configure_logging(level=None, log_path=LOG_PATH, events_path=EVENTS_PATH,
+                      max_bytes=10 * 1024 * 1024, backup_count=5, max_queue=10000):
+    """Route all logging through a background writer; safe to call more than once.
+
+    Records go to a human-readable log at log_path and to JSONL events at
+    events_path; both files rotate at max_bytes.
+    """
+    global listener, queue_handler
+    if listener is not None:
+        return
+    Path(events_path).parent.mkdir(parents=True, exist_ok=True)
+    text_handler = RotatingFileHandler(log_path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+    text_handler.setFormatter(logging.Formatter("%(asctime)s - %(message)s"))
+    json_handler = RotatingFileHandler(events_path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+    json_handler.setFormatter(JsonFormatter())
+
+    log_queue = queue.Queue(maxsize=max_queue)
+    queue_handler = BackgroundQueueHandler(log_queue)
+    queue_handler.addFilter(SessionFilter())
+    root = logging.getLogger()
+    root.setLevel(level or os.getenv("LOG_LEVEL", "INFO"))
+    root.addHandler(queue_handler)
+    listener = QueueListener(log_queue, text_handler, json_handler)
+    listener.start()
+    # Flush queued records on exit.
+    atexit.register(listener.stop)
+
+def set_session_id(session_id):
+    """Tag log records from the current context (thread or asyncio task) with session_id."""
+    return session_id_var.set(session_id)
+
+def log_event(event, msg, *args, level=logging.INFO, payload=None, **fields):
+    """Log a structured event; fields are written to the JSONL log.
+
+    payload holds verbose data (full LLM responses, answers) and is only kept
+    for a LOG_PAYLOAD_SAMPLE_RATE fraction of events.
+    """
+    logger = logging.getLogger()
+    if not logger.isEnabledFor(level):
+        return
+    if payload is not None and random.random() < payload_sample_rate:
+        fields["payload"] = payload
+    logger.log(level, msg, *args, extra={"event": event, "fields": fields})
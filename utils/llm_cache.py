@@ -0,0 +1,73 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+class LLMCache:
+    """Content-addressed SQLite cache for LLM responses with TTL and LRU eviction."""
+
+    def __init__(self, path="data/llm_cache.sqlite", max_entries=10000):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.hits = Counter()
+        self.misses = Counter()
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                template TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created REAL NOT NULL,
+                last_access REAL NOT NULL
+            )"""
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access)")
+        self.conn.commit()
+
+    @staticmethod
+    def make_key(model, temperature, prompt):
+        """Hash the model, temperature and rendered prompt into a cache key."""
+        payload = f"{model}\x00{temperature}\x00{prompt}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key, template, ttl):
+        """Return the cached response, or None if missing or older than ttl seconds."""
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute("SELECT response, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row and now - row[1] > ttl:
+                self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.conn.commit()
+                row = None
+            if row is None:
+                self.misses[template] += 1
+                return None
+            self.conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self.conn.commit()
+            self.hits[template] += 1
+            return row[0]
+
+    def put(self, key, template, response):
+        """Store a response and evict least recently used entries above max_entries."""
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, template, response, created, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, template, response, now, now)
+            )
+            count = self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            if count > self.max_entries:
+                self.conn.execute(
+                    "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY last_access ASC LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+            self.conn.commit()
+
+    def stats(self):
+        """Hit and miss counters per template."""
+        templates = set(self.hits) | set(self.misses)
+        return {t: {"hits": self.hits[t], "misses": self.misses[t]} for t in sorted(templates)}
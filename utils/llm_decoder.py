@@ -0,0 +1,60 @@
+import json
+import threading
+from collections import Counter
+
+class DecodeError(ValueError):
+    pass
+
+def extract_json(text):
+    """Return the first JSON object in text, tolerating code fences and surrounding prose."""
+    text = text.strip()
+    if text.startswith("```json\n") and text.endswith("\n```"):
+        text = text[8:-4]
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+    decoder = json.JSONDecoder()
+    start = text.find("{")
+    while start != -1:
+        try:
+            value, _ = decoder.raw_decode(text, start)
+            if isinstance(value, dict):
+                return value
+        except json.JSONDecodeError:
+            pass
+        start = text.find("{", start + 1)
+    raise DecodeError("No JSON object found in response")
+
+class ResponseDecoder:
+    """Decode LLM responses against per-template schemas and count failures per template."""
+
+    def __init__(self, schemas):
+        self.schemas = schemas
+        self.failures = Counter()
+        self.repaired = Counter()
+        self.unrecovered = Counter()
+        self.lock = threading.Lock()
+
+    def decode(self, template, text):
+        data = extract_json(text)
+        if not isinstance(data, dict):
+            raise DecodeError("Response is not a JSON object")
+        for key, expected in self.schemas.get(template, {}).items():
+            if key not in data:
+                raise DecodeError(f"Missing key '{key}'")
+            if isinstance(data[key], bool) or not isinstance(data[key], expected):
+                raise DecodeError(f"Key '{key}' has type {type(data[key]).__name__}")
+        return data
+
+    def record(self, counter, template):
+        with self.lock:
+            counter[template] += 1
+
+    def stats(self):
+        """Parse failures, successful repairs and unrecovered failures per template."""
+        templates = set(self.failures) | set(self.repaired) | set(self.unrecovered)
+        return {
+            t: {"failures": self.failures[t], "repaired": self.repaired[t], "unrecovered": self.unrecovered[t]}
+            for t in sorted(templates)
+        }
@@ -0,0 +1,80 @@
+import json
+import logging
+import math
+import threading
+from collections import deque
+
+ROUTE_KEYS = ("model", "temperature", "max_tokens", "timeout", "budget", "base_url")
+
+def load_routes(defaults, path=None) -> dict:
+    """Merge the per-route overrides in the JSON file at path into defaults."""
+    routes = {name: dict(settings) for name, settings in defaults.items()}
+    if path:
+        with open(path, "r") as f:
+            overrides = json.load(f)
+        for name, settings in overrides.items():
+            unknown = set(settings) - set(ROUTE_KEYS)
+            if unknown:
+                raise ValueError(f"Unknown settings {sorted(unknown)} for LLM route '{name}' in {path}")
+            routes.setdefault(name, {}).update(settings)
+    return routes
+
+class LLMRouter:
+    """Chat model client and latency budget per route (a prompt template name).
+
+    Routes without their own entry use "default". Clients are created with
+    factory(settings) and shared by routes with identical settings. When
+    override() returns a client (e.g. a fake registered for tests), it serves
+    every route instead.
+    """
+
+    def __init__(self, routes, factory, override=None, base_url=None, window=200, min_samples=20):
+        self.routes = routes
+        self.factory = factory
+        self.override = override
+        self.base_url = base_url
+        self.clients = {}
+        self.latencies = {}
+        self.window = window
+        self.min_samples = min_samples
+        self.lock = threading.Lock()
+
+    def settings(self, route) -> dict:
+        settings = {"base_url": self.base_url, **self.routes.get("default", {})}
+        settings.update(self.routes.get(route, {}))
+        return settings
+
+    def client(self, route="default"):
+        if self.override is not None:
+            llm = self.override()
+            if llm is not None:
+                return llm
+        settings = self.settings(route)
+        key = tuple(settings.get(name) for name in ROUTE_KEYS if name != "budget")
+        client = self.clients.get(key)
+        if client is None:
+            with self.lock:
+                client = self.clients.get(key)
+                if client is None:
+                    client = self.clients[key] = self.factory(settings)
+                    logging.info("Created LLM client for route %s: %s", route, settings.get("model"))
+        return client
+
+    def observe(self, route, seconds):
+        with self.lock:
+            samples = self.latencies.get(route)
+            if samples is None:
+                samples = self.latencies[route] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def budget(self, route) -> float | None:
+        """Seconds after which a call on route is hedged, or None."""
+        budget = self.settings(route).get("budget")
+        if budget != "p95":
+            return budget
+        with self.lock:
+            samples = sorted(self.latencies.get(route, ()))
+        # Too few calls yet for a meaningful p95.
+        if len(samples) < self.min_samples:
+            return None
+        return samples[math.ceil(0.95 * len(samples)) - 1]
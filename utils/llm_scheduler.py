@@ -0,0 +1,225 @@
+import itertools
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from utils.metrics import metrics
+
+# Lower value is dispatched first.
+PRIORITIES = {
+    "evaluation": 0,
+    "question": 1,
+    "hint": 2,
+    "weights": 3,
+    "feedback": 3,
+    "prefetch": 4,
+    "regrade": 5
+}
+# Metrics label per level; weights and feedback share a level and are reported as feedback.
+PRIORITY_NAMES = {level: name for name, level in PRIORITIES.items()}
+
+def estimate_tokens(text):
+    """Rough token count (about four characters per token)."""
+    return len(text) // 4 + 1
+
+class TokenBucket:
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = float(per_minute)
+        self.updated = time.monotonic()
+
+    def refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount):
+        """Seconds until amount tokens are available (amount is capped at capacity)."""
+        self.refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def take(self, amount):
+        # A negative amount refunds tokens, never beyond capacity.
+        self.tokens = min(self.capacity, self.tokens - min(amount, self.capacity))
+
+class Request:
+    def __init__(self, prompt, level, route):
+        self.prompt = prompt
+        self.level = level
+        self.route = route
+        self.started = False
+        self.hedged = False
+        # Calls (the original and a hedge) that have not finished yet.
+        self.outstanding = 0
+        self.queued_at = time.perf_counter()
+        self.future = Future()
+
+class LLMScheduler:
+    """Process-wide gate for LLM calls.
+
+    Calls are queued by priority class, dispatched by a fixed pool of worker
+    threads under requests/min and tokens/min token buckets, and identical
+    prompts that are already queued or running share one call. Each call goes
+    to the client of its route (see utils/llm_router.py); a call still running
+    after its route's latency budget gets a hedged duplicate, and whichever
+    finishes first answers the request. Clients are any objects exposing
+    invoke(prompt) and stream(prompt), including local fakes.
+    """
+
+    def __init__(self, router, requests_per_min=500, tokens_per_min=200000, max_concurrency=8, completion_tokens=300):
+        self.router = router
+        self.request_bucket = TokenBucket(requests_per_min)
+        self.token_bucket = TokenBucket(tokens_per_min)
+        self.completion_tokens = completion_tokens
+        self.queue = queue.PriorityQueue()
+        self.counter = itertools.count()
+        self.in_flight = {}
+        self.lock = threading.Lock()
+        self.bucket_lock = threading.Lock()
+        self.coalesced = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.workers = [
+            threading.Thread(target=self.dispatch, name=f"llm-scheduler-{i}", daemon=True)
+            for i in range(max_concurrency)
+        ]
+        for worker in self.workers:
+            worker.start()
+
+    def submit(self, prompt, priority="question", coalesce=True, route=None) -> Future:
+        """Queue a call on route (default: the priority name); with coalesce, an identical prompt already in flight is shared."""
+        level = PRIORITIES.get(priority, max(PRIORITIES.values()) + 1)
+        with self.lock:
+            request = self.in_flight.get(prompt) if coalesce else None
+            if request is not None:
+                self.coalesced += 1
+                self.requeue(request, level)
+                return request.future
+            request = Request(prompt, level, route or priority)
+            if coalesce:
+                self.in_flight[prompt] = request
+            self.queue.put((level, next(self.counter), request))
+        return request.future
+
+    def requeue(self, request, level) -> bool:
+        """Re-queue a request that has not started at a higher priority; the stale entry is skipped. Needs self.lock."""
+        if request.started or level >= request.level:
+            return False
+        request.level = level
+        self.queue.put((level, next(self.counter), request))
+        return True
+
+    def promote(self, prompt, priority) -> bool:
+        """Move an already queued call for prompt up to priority without issuing a new one."""
+        with self.lock:
+            request = self.in_flight.get(prompt)
+            return request is not None and self.requeue(request, PRIORITIES[priority])
+
+    def invoke(self, prompt, priority="question", coalesce=True, route=None):
+        return self.submit(prompt, priority, coalesce, route).result()
+
+    def stream(self, prompt, priority="question", route=None):
+        """Stream a response once the rate limits allow it.
+
+        Streams are not queued behind other calls; the caller is already waiting
+        on the output, so only the rate limits are applied.
+        """
+        self.acquire(self.request_bucket, 1)
+        self.acquire(self.token_bucket, estimate_tokens(prompt) + self.completion_tokens)
+        route = route or priority
+        with metrics.span("llm_call", priority=priority, route=route, mode="stream"):
+            yield from self.router.client(route).stream(prompt)
+
+    def acquire(self, bucket, amount):
+        while True:
+            with self.bucket_lock:
+                wait = bucket.wait_time(amount)
+                if wait == 0:
+                    bucket.take(amount)
+                    return
+            time.sleep(wait)
+
+    def dispatch(self):
+        while True:
+            _, _, request = self.queue.get()
+            with self.lock:
+                stale = request.started
+                request.started = True
+            if stale:
+                continue
+            # Rate limit tokens are only taken for work in hand, so idle workers hold none.
+            self.acquire(self.request_bucket, 1)
+            self.acquire(self.token_bucket, estimate_tokens(request.prompt) + self.completion_tokens)
+            priority = PRIORITY_NAMES.get(request.level, "other")
+            metrics.observe("llm_queue_seconds", time.perf_counter() - request.queued_at, priority=priority)
+            with self.lock:
+                request.outstanding += 1
+            budget = self.router.budget(request.route)
+            timer = None
+            if budget is not None:
+                timer = threading.Timer(budget, self.hedge, (request, priority))
+                timer.daemon = True
+                timer.start()
+            try:
+                self.call(request, priority, "invoke")
+            finally:
+                if timer is not None:
+                    timer.cancel()
+                with self.lock:
+                    if self.in_flight.get(request.prompt) is request:
+                        del self.in_flight[request.prompt]
+
+    def call(self, request, priority, mode):
+        start = time.perf_counter()
+        try:
+            with metrics.span("llm_call", priority=priority, route=request.route, mode=mode):
+                response = self.router.client(request.route).invoke(request.prompt)
+        except Exception as e:
+            logging.warning("LLM call failed (%s): %s", mode, e)
+            self.complete(request, error=e)
+            return
+        self.router.observe(request.route, time.perf_counter() - start)
+        if self.complete(request, response=response) and mode == "hedge":
+            with self.lock:
+                self.hedge_wins += 1
+            metrics.increment("llm_hedges_total", route=request.route, result="won")
+
+    def complete(self, request, response=None, error=None) -> bool:
+        """Answer the request with the first successful call; True if this call did."""
+        with self.lock:
+            request.outstanding -= 1
+            if request.future.done():
+                return False
+            if error is not None:
+                # The other call may still succeed.
+                if request.outstanding > 0:
+                    return False
+                request.future.set_exception(error)
+                return False
+            request.future.set_result(response)
+            return True
+
+    def hedge(self, request, priority):
+        """Send a duplicate of a call that has run past its latency budget."""
+        with self.lock:
+            if request.future.done() or request.hedged:
+                return
+            request.hedged = True
+            request.outstanding += 1
+            self.hedges += 1
+        metrics.increment("llm_hedges_total", route=request.route, result="sent")
+        logging.info("LLM call on route %s exceeded its latency budget, sending a hedged request", request.route)
+        self.acquire(self.request_bucket, 1)
+        self.acquire(self.token_bucket, estimate_tokens(request.prompt) + self.completion_tokens)
+        self.call(request, priority, "hedge")
+
+    def stats(self):
+        return {
+            "queued": self.queue.qsize(), "in_flight": len(self.in_flight), "coalesced": self.coalesced,
+            "hedges": self.hedges, "hedge_wins": self.hedge_wins
+        }
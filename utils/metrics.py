@@ -0,0 +1,159 @@
+import json
+import logging
+import math
+import random
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from utils.event_log import log_event
+
+METRICS_PATH = "data/metrics.json"
+QUANTILES = (0.5, 0.95, 0.99)
+
+class Histogram:
+    """Exact count, sum and max, with percentiles over a bounded reservoir of samples."""
+
+    def __init__(self, max_samples=10000):
+        self.max_samples = max_samples
+        self.samples = []
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+        if len(self.samples) < self.max_samples:
+            self.samples.append(value)
+        else:
+            # Reservoir sampling keeps a uniform sample of every observation.
+            i = random.randrange(self.count)
+            if i < self.max_samples:
+                self.samples[i] = value
+
+    def summary(self):
+        ordered = sorted(self.samples)
+        result = {"count": self.count, "sum": self.sum, "max": self.max}
+        for q in QUANTILES:
+            result[f"p{int(q * 100)}"] = ordered[max(0, math.ceil(q * len(ordered)) - 1)] if ordered else 0.0
+        return result
+
+class Metrics:
+    """Process-wide latency histograms and counters, keyed by name and labels.
+
+        with metrics.span("vector_query", topic="Python"):
+            ...
+        metrics.increment("llm_tokens_total", 120, template="question", kind="prompt")
+
+    A span records its wall time in the "<name>_seconds" histogram and logs a
+    DEBUG "span" event, so per-session traces can be read from the JSONL log.
+    """
+
+    def __init__(self):
+        self.histograms = {}
+        self.counters = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(name, labels):
+        return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def observe(self, name, value, **labels):
+        key = self.key(name, labels)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def increment(self, name, amount=1, **labels):
+        key = self.key(name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    @contextmanager
+    def span(self, name, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.observe(f"{name}_seconds", elapsed, **labels)
+            log_event("span", "%s took %.4fs", name, elapsed, level=logging.DEBUG, span=name, seconds=elapsed, **labels)
+
+    def reset(self):
+        with self.lock:
+            self.histograms.clear()
+            self.counters.clear()
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "histograms": [
+                    {"name": name, "labels": dict(labels), **histogram.summary()}
+                    for (name, labels), histogram in sorted(self.histograms.items())
+                ],
+                "counters": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(self.counters.items())
+                ]
+            }
+
+    def prometheus(self, prefix="interview_"):
+        """Render all metrics in the Prometheus text exposition format (histograms as summaries)."""
+        snapshot = self.snapshot()
+        lines = []
+        typed = set()
+        for h in snapshot["histograms"]:
+            name = prefix + h["name"]
+            if name not in typed:
+                lines.append(f"# TYPE {name} summary")
+                typed.add(name)
+            for q in QUANTILES:
+                lines.append(f"{name}{format_labels(h['labels'], quantile=q)} {h[f'p{int(q * 100)}']}")
+            lines.append(f"{name}_sum{format_labels(h['labels'])} {h['sum']}")
+            lines.append(f"{name}_count{format_labels(h['labels'])} {h['count']}")
+        for c in snapshot["counters"]:
+            name = prefix + c["name"]
+            if name not in typed:
+                lines.append(f"# TYPE {name} counter")
+                typed.add(name)
+            lines.append(f"{name}{format_labels(c['labels'])} {c['value']}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path=METRICS_PATH):
+        """Write a JSON snapshot, or Prometheus text if path ends in .prom."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix == ".prom":
+            content = self.prometheus()
+        else:
+            content = json.dumps(self.snapshot(), indent=2)
+        with open(path, "w") as f:
+            f.write(content)
+        logging.info("Wrote metrics to %s", path)
+
+    def report(self):
+        """Human-readable latency and counter table, e.g. for main.py --profile."""
+        snapshot = self.snapshot()
+        lines = [f"{'span':<56}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'total s':>10}"]
+        for h in snapshot["histograms"]:
+            name = h["name"].removesuffix("_seconds") + format_labels(h["labels"])
+            lines.append(
+                f"{name:<56}{h['count']:>7}{h['p50'] * 1000:>10.1f}{h['p95'] * 1000:>10.1f}"
+                f"{h['p99'] * 1000:>10.1f}{h['sum']:>10.2f}"
+            )
+        for c in snapshot["counters"]:
+            lines.append(f"{c['name'] + format_labels(c['labels']):<56}{c['value']:>7}")
+        return "\n".join(lines)
+
+def format_labels(labels, **extra):
+    labels = {**labels, **extra}
+    if not labels:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in labels.values())
+    return "{" + ",".join(f'{k}="{v}"' for k, v in zip(labels, escaped)) + "}"
+
+metrics = Metrics()
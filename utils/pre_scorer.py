@@ -0,0 +1,110 @@
+import random
+import re
+import numpy as np
+from utils.event_log import log_event
+from utils.metrics import metrics
+
+NON_ANSWER = re.compile(
+    r"\b(i\s+(do\s*n[o']?t|dont)\s+know|no\s+idea|not\s+sure|idk|no\s+clue|(can'?t|do\s*n[o']?t)\s+remember)\b"
+    r"|^\W*(pass|skip|next|\?+)\W*$",
+    re.I
+)
+STOPWORDS = {
+    "the", "and", "for", "are", "with", "that", "this", "from", "its", "into", "can", "not", "but",
+    "you", "your", "has", "have", "was", "were", "which", "when", "where", "what", "how", "their", "they"
+}
+
+def content_words(text):
+    return {word for word in re.findall(r"[a-z0-9_]+", text.lower()) if len(word) > 2 and word not in STOPWORDS}
+
+class PreScorer:
+    """Score clearly trivial answers locally so they skip the evaluation LLM call.
+
+    Two rules, both deliberately conservative:
+        non_answer  an empty answer, or a short explicit non-answer ("I don't
+                    know", "idk", "pass") that is unrelated to the answer key
+                    (similarity below low and none of its content words),
+                    scores non_answer_score; terse answers such as "O(log n)"
+                    are not non-answers and go to the LLM
+        answer_key  an answer close to the answer key both in embedding
+                    similarity and in the key's content words it covers,
+                    scores answer_key_score
+    Everything else is left to the LLM. A shadow_rate fraction of the
+    short-circuited answers is still sent to the LLM so agreement can be
+    measured; see record().
+    """
+
+    def __init__(self, embedder, low=0.25, high=0.9, min_overlap=0.8, max_non_answer_words=8,
+                 non_answer_score=0, answer_key_score=9, shadow_rate=0.05, seed=None):
+        self.embedder = embedder
+        self.low = low
+        self.high = high
+        self.min_overlap = min_overlap
+        self.max_non_answer_words = max_non_answer_words
+        self.non_answer_score = non_answer_score
+        self.answer_key_score = answer_key_score
+        self.shadow_rate = shadow_rate
+        self.random = random.Random(seed)
+
+    def similarity(self, answer_key, answer):
+        # One batch for both, bypassing the query embedding cache: answer keys
+        # would push out the topic and retrieval queries it is sized for.
+        key, vector = np.asarray(self.embedder.embed_documents([answer_key, answer]), dtype=np.float32)
+        return float(key @ vector / max(np.linalg.norm(key) * np.linalg.norm(vector), 1e-12))
+
+    def assess(self, answer, answer_key=None) -> dict:
+        """Features of the answer and, if a rule applies, its evaluation.
+
+        Without answer_key (e.g. for follow-up questions) only the lexical non-answer rule is used.
+        """
+        words = len(answer.split())
+        assessment = {"rule": None, "evaluation": None, "words": words, "similarity": None, "overlap": None}
+        dismissive = words <= self.max_non_answer_words and NON_ANSWER.search(answer) is not None
+        if words == 0:
+            assessment["rule"] = "non_answer"
+        elif not answer_key:
+            assessment["rule"] = "non_answer" if dismissive else None
+        else:
+            with metrics.span("prescore"):
+                assessment["similarity"] = round(self.similarity(answer_key, answer), 4)
+            key_words = content_words(answer_key)
+            assessment["overlap"] = round(len(key_words & content_words(answer)) / len(key_words), 4) if key_words else 0.0
+            if dismissive and assessment["similarity"] < self.low and assessment["overlap"] == 0:
+                assessment["rule"] = "non_answer"
+            elif assessment["similarity"] >= self.high and assessment["overlap"] >= self.min_overlap:
+                assessment["rule"] = "answer_key"
+        if assessment["rule"] == "non_answer":
+            assessment["evaluation"] = {
+                "score": self.non_answer_score,
+                "feedback": "The answer does not attempt the question, so no credit can be given. Review the core concept and try to explain it in your own words."
+            }
+        elif assessment["rule"] == "answer_key":
+            assessment["evaluation"] = {
+                "score": self.answer_key_score,
+                "feedback": "The answer covers the expected points accurately and clearly."
+            }
+        metrics.increment("prescore_total", rule=assessment["rule"] or "llm")
+        return assessment
+
+    def shadow(self) -> bool:
+        """Whether to check this short-circuited answer against the LLM anyway."""
+        return self.random.random() < self.shadow_rate
+
+    def record(self, assessment, evaluation):
+        """Log the features of an assessed answer with the LLM's score (None if it was not asked).
+
+        For shadowed answers this measures agreement with the rule; for answers
+        left to the LLM the logged features show where thresholds could move.
+        """
+        llm_score = evaluation["score"] if evaluation is not None else None
+        pre_score = assessment["evaluation"]["score"] if assessment["evaluation"] is not None else None
+        log_event(
+            "prescore", "Pre-score %s: similarity=%s, overlap=%s, words=%d, LLM score=%s",
+            assessment["rule"] or "llm", assessment["similarity"], assessment["overlap"], assessment["words"], llm_score,
+            rule=assessment["rule"], similarity=assessment["similarity"], overlap=assessment["overlap"],
+            words=assessment["words"], pre_score=pre_score, llm_score=llm_score
+        )
+        if pre_score is not None and llm_score is not None:
+            error = abs(pre_score - llm_score)
+            metrics.observe("prescore_abs_error", error, rule=assessment["rule"])
+            metrics.increment("prescore_agreement_total", rule=assessment["rule"], agreed=str(error <= 2).lower())
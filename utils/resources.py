@@ -0,0 +1,188 @@
+import atexit
+import logging
+import os
+import threading
+
+class ResourceRegistry:
+    """Thread-safe, process-wide registry of expensive shared resources."""
+
+    def __init__(self):
+        self.resources = {}
+        self.locks = {}
+        self.lock = threading.Lock()
+
+    def get(self, name, factory):
+        """Return the resource registered under name, creating it once with factory."""
+        resource = self.resources.get(name)
+        if resource is None:
+            # One lock per resource, so a slow factory (e.g. the embedder warming
+            # up in the background) does not block unrelated resources.
+            with self.lock:
+                name_lock = self.locks.setdefault(name, threading.Lock())
+            with name_lock:
+                resource = self.resources.get(name)
+                if resource is None:
+                    resource = factory()
+                    self.resources[name] = resource
+                    logging.info("Created shared resource: %s", name)
+        return resource
+
+    def peek(self, name):
+        """The resource registered under name, or None; never creates it."""
+        return self.resources.get(name)
+
+    def register(self, name, resource):
+        """Install a resource directly, e.g. a stand-in model for tests."""
+        self.resources[name] = resource
+
+    def clear(self):
+        with self.lock:
+            self.resources.clear()
+
+registry = ResourceRegistry()
+warm_up_thread = None
+
+# Heavy modules (langchain_openai, langchain_huggingface, chromadb, torch) are
+# imported inside the factories so importing the agent stays cheap.
+
+def create_embedder():
+    from langchain_huggingface import HuggingFaceEmbeddings
+    from utils.embedding_cache import CachedEmbeddings
+    model_name = "all-MiniLM-L6-v2"
+    namespace = model_name
+    model_kwargs = {}
+    if os.getenv("EMBEDDER_BACKEND", "torch") == "onnx":
+        # The int8-quantized ONNX export of the same model (needs optimum[onnxruntime]).
+        # Same tokenizer, pooling and dimension, so existing collections stay usable.
+        onnx_file = os.getenv("EMBEDDER_ONNX_FILE", "onnx/model_quint8_avx2.onnx")
+        model_kwargs = {"backend": "onnx", "model_kwargs": {"file_name": onnx_file}}
+        namespace = f"{model_name}:{onnx_file}"
+    embedder = HuggingFaceEmbeddings(model_name=model_name, model_kwargs=model_kwargs)
+    cache_size = int(os.getenv("EMBEDDING_CACHE_SIZE", "4096"))
+    if cache_size <= 0:
+        return embedder
+    cached = CachedEmbeddings(embedder, namespace, max_entries=cache_size)
+    atexit.register(cached.close)
+    return cached
+
+def create_vector_store():
+    from utils.vector_store import VectorStore
+    return VectorStore(embedder=get_embedder())
+
+def create_chat_model(settings):
+    from langchain_openai import ChatOpenAI
+    base_url = settings.get("base_url")
+    llm = ChatOpenAI(
+        model=settings["model"],
+        # Local OpenAI-compatible servers usually accept any key.
+        api_key=os.getenv("OPENAI_API_KEY") or ("local" if base_url else None),
+        base_url=base_url,
+        temperature=settings["temperature"],
+        max_tokens=settings.get("max_tokens"),
+        timeout=settings.get("timeout")
+    )
+    logging.info("Initialized LLM %s (%s)", settings["model"], base_url or "OpenAI")
+    return llm
+
+def create_llm_router():
+    from prompts.templates import llm_routes
+    from utils.llm_router import LLMRouter, load_routes
+    return LLMRouter(
+        load_routes(llm_routes, os.getenv("LLM_ROUTES")),
+        create_chat_model,
+        # A registered "llm" (e.g. benchmarks.fakes.FakeLLM) serves every route.
+        override=lambda: registry.peek("llm"),
+        base_url=os.getenv("LLM_BASE_URL")
+    )
+
+def create_llm_cache():
+    from utils.llm_cache import LLMCache
+    return LLMCache()
+
+def create_pre_scorer():
+    from utils.pre_scorer import PreScorer
+    return PreScorer(
+        get_embedder(),
+        low=float(os.getenv("PRESCORE_LOW", "0.25")),
+        high=float(os.getenv("PRESCORE_HIGH", "0.9")),
+        shadow_rate=float(os.getenv("PRESCORE_SHADOW_RATE", "0.05"))
+    )
+
+def create_results_store():
+    from utils.results_store import ResultsStore
+    return ResultsStore()
+
+def create_scheduler():
+    from utils.llm_scheduler import LLMScheduler
+    return LLMScheduler(
+        get_llm_router(),
+        requests_per_min=int(os.getenv("LLM_REQUESTS_PER_MIN", "500")),
+        tokens_per_min=int(os.getenv("LLM_TOKENS_PER_MIN", "200000")),
+        max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+    )
+
+def create_decoder():
+    from prompts.templates import response_schemas
+    from utils.llm_decoder import ResponseDecoder
+    return ResponseDecoder(response_schemas)
+
+def create_executor():
+    from concurrent.futures import ThreadPoolExecutor
+    return ThreadPoolExecutor(max_workers=8, thread_name_prefix="prefetch")
+
+def create_node_executor():
+    from concurrent.futures import ThreadPoolExecutor
+    return ThreadPoolExecutor(max_workers=32, thread_name_prefix="graph-node")
+
+def get_embedder():
+    return registry.get("embedder", create_embedder)
+
+def get_vector_store():
+    return registry.get("vector_store", create_vector_store)
+
+def get_llm_router():
+    return registry.get("llm_router", create_llm_router)
+
+def get_llm(route="default"):
+    """Chat model client for route, a prompt template name (see llm_routes in prompts/templates.py)."""
+    return get_llm_router().client(route)
+
+def get_llm_cache():
+    return registry.get("llm_cache", create_llm_cache)
+
+def get_pre_scorer():
+    return registry.get("pre_scorer", create_pre_scorer)
+
+def get_results_store():
+    return registry.get("results_store", create_results_store)
+
+def get_scheduler():
+    return registry.get("scheduler", create_scheduler)
+
+def get_decoder():
+    return registry.get("decoder", create_decoder)
+
+def get_executor():
+    return registry.get("executor", create_executor)
+
+def get_node_executor():
+    # Separate from get_executor(): nodes block on executor tasks (prefetch,
+    # weights), so sharing one pool could deadlock under load.
+    return registry.get("node_executor", create_node_executor)
+
+def warm_up():
+    """Load the vector store, embedder and LLM client in a background thread."""
+    global warm_up_thread
+    if warm_up_thread is None:
+        warm_up_thread = threading.Thread(target=load_all, name="warm-up", daemon=True)
+        warm_up_thread.start()
+    return warm_up_thread
+
+def load_all():
+    try:
+        get_vector_store()
+        get_llm()
+        logging.info("Warm-up complete")
+    except Exception as e:
+        # The foreground call will retry and surface the error.
+        logging.warning("Warm-up failed: %s", e)
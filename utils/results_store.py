@@ -0,0 +1,205 @@
+import argparse
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+RESULTS_PATH = "data/results.sqlite"
+
+def parse_date(value) -> float:
+    """Epoch seconds of an ISO date for the since/until filters; an argparse type."""
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid date '{value}', expected e.g. 2026-01-31 or 2026-01-31T12:00")
+
+class ResultsStore:
+    """Append-only SQLite store of finished interviews.
+
+    One row per interview, written once when the summary is ready. topic,
+    created and final_score are indexed columns for listing and analytics; the
+    full result is kept as JSON and rendered to markdown only when exported.
+    """
+
+    def __init__(self, path=RESULTS_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        # WAL lets other processes read (and analytics run) while interviews are written.
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS interviews (
+                id TEXT PRIMARY KEY,
+                session_id TEXT,
+                topic TEXT NOT NULL,
+                created REAL NOT NULL,
+                final_score REAL NOT NULL,
+                question_count INTEGER NOT NULL,
+                record TEXT NOT NULL
+            )"""
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_interviews_topic_created ON interviews (topic, created)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_interviews_created ON interviews (created)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_interviews_score ON interviews (final_score)")
+        # New scores from regrade.py, kept next to the originals per named run.
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS regrades (
+                run TEXT NOT NULL,
+                interview_id TEXT NOT NULL,
+                old_final_score REAL NOT NULL,
+                new_final_score REAL NOT NULL,
+                old_scores TEXT NOT NULL,
+                new_scores TEXT NOT NULL,
+                feedbacks TEXT NOT NULL,
+                created REAL NOT NULL,
+                PRIMARY KEY (run, interview_id)
+            )"""
+        )
+        self.conn.commit()
+
+    def save(self, state, session_id=None) -> str:
+        """Store a finished interview (state after generate_feedback) and return its ID."""
+        feedback = state["feedback"]
+        record = {
+            "id": uuid.uuid4().hex,
+            "session_id": session_id,
+            "topic": state["topic"],
+            "created": time.time(),
+            "final_score": feedback["final_score"],
+            "summary": feedback["summary"],
+            "weights": feedback["weights"],
+            "questions": state["questions"],
+            "answers": state["answers"],
+            "scores": state["scores"],
+            "feedbacks": state["feedbacks"],
+            "follow_up_answers": state.get("follow_up_answers", []),
+            "follow_up_scores": state.get("follow_up_scores", []),
+            "follow_up_feedbacks": state.get("follow_up_feedbacks", []),
+            "history": state.get("history", [])
+        }
+        with self.lock:
+            self.conn.execute(
+                "INSERT INTO interviews (id, session_id, topic, created, final_score, question_count, record) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (record["id"], session_id, record["topic"], record["created"], record["final_score"],
+                 len(record["questions"]), json.dumps(record, ensure_ascii=False))
+            )
+            self.conn.commit()
+        return record["id"]
+
+    def get(self, interview_id) -> dict | None:
+        with self.lock:
+            row = self.conn.execute("SELECT record FROM interviews WHERE id = ?", (interview_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    @staticmethod
+    def where(topic=None, since=None, until=None, min_score=None, max_score=None):
+        clauses, params = [], []
+        for clause, value in (
+            ("topic = ?", topic), ("created >= ?", since), ("created < ?", until),
+            ("final_score >= ?", min_score), ("final_score <= ?", max_score)
+        ):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def query(self, limit=50, offset=0, **filters) -> list[dict]:
+        """Newest interviews first, without the full record. Filters: topic, since, until (epoch seconds), min_score, max_score."""
+        where, params = self.where(**filters)
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT id, session_id, topic, created, final_score, question_count FROM interviews{where} "
+                "ORDER BY created DESC LIMIT ? OFFSET ?",
+                params + [limit, offset]
+            ).fetchall()
+        keys = ("id", "session_id", "topic", "created", "final_score", "question_count")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def records(self, page_size=200, **filters):
+        """Yield full records oldest first, reading page_size rows at a time."""
+        where, params = self.where(**filters)
+        after = (-1.0, "")
+        while True:
+            keyset = "(created, id) > (?, ?)"
+            with self.lock:
+                rows = self.conn.execute(
+                    f"SELECT created, id, record FROM interviews{where + ' AND ' if where else ' WHERE '}{keyset} "
+                    "ORDER BY created, id LIMIT ?",
+                    params + list(after) + [page_size]
+                ).fetchall()
+            for created, interview_id, record in rows:
+                yield json.loads(record)
+            if len(rows) < page_size:
+                return
+            after = (rows[-1][0], rows[-1][1])
+
+    def save_regrade(self, run, record, new_scores, feedbacks, new_final_score):
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO regrades (run, interview_id, old_final_score, new_final_score, old_scores, new_scores, feedbacks, created) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (run, record["id"], record["final_score"], new_final_score, json.dumps(record["scores"]),
+                 json.dumps(new_scores), json.dumps(feedbacks, ensure_ascii=False), time.time())
+            )
+            self.conn.commit()
+
+    def regraded_ids(self, run) -> set[str]:
+        with self.lock:
+            rows = self.conn.execute("SELECT interview_id FROM regrades WHERE run = ?", (run,)).fetchall()
+        return {row[0] for row in rows}
+
+    def regrade_stats(self, run) -> dict:
+        """Interviews re-graded in run and their mean old and new final scores."""
+        with self.lock:
+            count, old, new = self.conn.execute(
+                "SELECT COUNT(*), AVG(old_final_score), AVG(new_final_score) FROM regrades WHERE run = ?", (run,)
+            ).fetchone()
+        return {"interviews": count, "avg_old_score": old, "avg_new_score": new}
+
+    def stats(self, **filters) -> list[dict]:
+        """Interview count and score statistics per topic."""
+        where, params = self.where(**filters)
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT topic, COUNT(*), AVG(final_score), MIN(final_score), MAX(final_score) FROM interviews{where} "
+                "GROUP BY topic ORDER BY COUNT(*) DESC",
+                params
+            ).fetchall()
+        return [
+            {"topic": topic, "interviews": count, "avg_score": avg, "min_score": low, "max_score": high}
+            for topic, count, avg, low, high in rows
+        ]
+
+def render_markdown(record) -> str:
+    """Markdown summary of a stored interview (the format of the former output/*.md files)."""
+    timestamp = datetime.fromtimestamp(record["created"]).strftime("%Y%m%d_%H%M%S")
+    parts = [
+        f"# Interview Summary for {record['topic'].capitalize()} ({timestamp})\n\n",
+        f"**Final Interview Score: {record['final_score']:.1f}/10**\n\n"
+    ]
+    follow_ups = record.get("follow_up_answers", [])
+    for i, (question, answer, score, feedback, weight) in enumerate(zip(
+        record["questions"], record["answers"], record["scores"], record["feedbacks"], record["weights"]
+    )):
+        parts.append(
+            f"## Question {i + 1}\n"
+            f"**Question**: {question['question']} ({question['difficulty'].capitalize()})\n"
+            f"**Answer**: {answer}\n"
+            f"**Score**: {score}/10\n"
+            f"**Weight**: {weight:.2f}\n"
+            f"**Feedback**: {feedback}\n"
+        )
+        if i < len(follow_ups):
+            parts.append(
+                f"**Follow-up Answer**: {follow_ups[i]}\n"
+                f"**Follow-up Score**: {record['follow_up_scores'][i]}/10\n"
+                f"**Follow-up Feedback**: {record['follow_up_feedbacks'][i]}\n\n"
+            )
+        else:
+            parts.append("\n")
+    parts.append(f"## Final Summary\n**Summary**: {record['summary']}\n")
+    return "".join(parts)
@@ -0,0 +1,47 @@
+import re
+
+ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+def partial_json_string(text, key):
+    """Return the (possibly unfinished) string value of key in a streamed JSON object.
+
+    Returns None until the opening quote of the value has arrived. Escape
+    sequences cut off at the end of text are left out until they complete.
+    """
+    match = re.search(r'"' + re.escape(key) + r'"\s*:\s*"', text)
+    if not match:
+        return None
+    chars = []
+    i = match.end()
+    while i < len(text):
+        char = text[i]
+        if char == '"':
+            break
+        if char == "\\":
+            if i + 1 >= len(text):
+                break
+            escape = text[i + 1]
+            if escape == "u":
+                if i + 6 > len(text):
+                    break
+                try:
+                    chars.append(chr(int(text[i + 2:i + 6], 16)))
+                except ValueError:
+                    pass
+                i += 6
+                continue
+            chars.append(ESCAPES.get(escape, escape))
+            i += 2
+            continue
+        chars.append(char)
+        i += 1
+    return "".join(chars)
+
+def print_tokens(event, text):
+    """Token sink for the CLI: prints a label on start and each token as it arrives."""
+    if event == "start":
+        print(f"\n{text}: ", end="", flush=True)
+    elif event == "token":
+        print(text, end="", flush=True)
+    else:
+        print()
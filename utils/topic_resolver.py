@@ -0,0 +1,70 @@
+import json
+import logging
+import threading
+from pathlib import Path
+import numpy as np
+from utils.metrics import metrics
+
+# Two characters, so that aliases such as "ML" and "JS" can be entered.
+MIN_TOPIC_LENGTH = 2
+TOPIC_ERROR = f"Please enter a valid topic (at least {MIN_TOPIC_LENGTH} characters)."
+
+def valid_topic(text) -> bool:
+    return len(text.strip()) >= MIN_TOPIC_LENGTH
+
+class TopicResolver:
+    """Map free-text topics to canonical bank topics using a cached embedding matrix.
+
+    The nearest topic must reach threshold and beat the best different topic by
+    margin, so text close to two topics (e.g. "Java" and "JavaScript") resolves
+    to neither.
+    """
+
+    def __init__(self, embedder, topics, aliases_path="data/topic_aliases.json", threshold=0.6, margin=0.05, max_cache=1024):
+        self.embedder = embedder
+        self.threshold = threshold
+        self.margin = margin
+        self.max_cache = max_cache
+        self.cache = {}
+        self.lock = threading.Lock()
+
+        topics = sorted(set(topics))
+        names = {topic.lower(): topic for topic in topics}
+        aliases_path = Path(aliases_path)
+        if aliases_path.exists():
+            with open(aliases_path, "r") as f:
+                for alias, topic in json.load(f).items():
+                    if topic in topics:
+                        names.setdefault(alias.lower(), topic)
+        self.names = names
+        self.labels = list(names.values())
+        if names:
+            with metrics.span("embedding", op="documents"):
+                matrix = np.asarray(embedder.embed_documents(list(names)), dtype=np.float32)
+            self.matrix = matrix / np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+        else:
+            self.matrix = np.zeros((0, 0), dtype=np.float32)
+
+    def resolve(self, text):
+        """Return the canonical topic for text, or None if nothing is close enough."""
+        key = " ".join(text.lower().split())
+        with self.lock:
+            if key in self.cache:
+                return self.cache[key]
+        topic = self.names.get(key)
+        if topic is None and len(self.labels):
+            with metrics.span("embedding", op="query"):
+                vector = np.asarray(self.embedder.embed_query(key), dtype=np.float32)
+            scores = self.matrix @ (vector / max(np.linalg.norm(vector), 1e-12))
+            best = int(np.argmax(scores))
+            # Aliases of the best topic are not competitors.
+            others = [score for label, score in zip(self.labels, scores) if label != self.labels[best]]
+            runner_up = max(others, default=-1.0)
+            if scores[best] >= self.threshold and scores[best] - runner_up >= self.margin:
+                topic = self.labels[best]
+            logging.info("Resolved topic '%s' to %s (similarity=%.2f, runner-up=%.2f)", text, topic, scores[best], runner_up)
+        with self.lock:
+            if len(self.cache) >= self.max_cache:
+                self.cache.pop(next(iter(self.cache)))
+            self.cache[key] = topic
+        return topic
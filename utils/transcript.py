@@ -0,0 +1,44 @@
+from utils.types import TranscriptEntry
+
+# Rough characters-per-token ratio used to keep prompt views within budget.
+CHARS_PER_TOKEN = 4
+
+def add_entry(state, kind: str, text: str):
+    """Append a typed entry ("question", "answer", "hint" or "follow_up") to the transcript."""
+    entry: TranscriptEntry = {"kind": kind, "text": text}
+    state.setdefault("history", []).append(entry)
+
+def asked_questions(history) -> list[str]:
+    return [entry["text"] for entry in history if entry["kind"] in ("question", "follow_up")]
+
+def history_for_prompt(history, max_entries: int = 4, max_tokens: int = 300) -> str:
+    """Render a bounded view of the transcript for prompts.
+
+    The view lists the asked question texts plus the last max_entries entries,
+    dropping the oldest lines until it fits in roughly max_tokens tokens.
+    """
+    if not history:
+        return ""
+    labels = {"question": "Question", "answer": "Answer", "hint": "Hint", "follow_up": "Follow-up Question"}
+    budget = max_tokens * CHARS_PER_TOKEN
+    max_line = budget // 4
+
+    recent = [
+        f"{labels[entry['kind']]}: {entry['text'][:max_line]}"
+        for entry in history[-max_entries:]
+    ]
+    questions = [text[:max_line] for text in asked_questions(history[:-max_entries])]
+
+    lines = recent
+    while lines and sum(len(line) + 1 for line in lines) > budget:
+        lines = lines[1:]
+    budget -= sum(len(line) + 1 for line in lines)
+    asked = []
+    for text in reversed(questions):
+        if len(text) + 3 > budget:
+            break
+        asked.insert(0, text)
+        budget -= len(text) + 3
+    if asked:
+        lines = ["Asked questions: " + " | ".join(asked)] + lines
+    return "\n".join(lines)
@@ -1,5 +1,9 @@
 from typing import Any, Dict, List, TypedDict
 
+class TranscriptEntry(TypedDict):
+    kind: str  # "question", "answer", "hint" or "follow_up"
+    text: str
+
 class InterviewState(TypedDict):
     topic: str
     question_count: int
@@ -7,11 +11,20 @@ class InterviewState(TypedDict):
     answers: List[str]
     scores: List[int]
     feedbacks: List[str]
-    history: str
+    history: List[TranscriptEntry]
     current_question: Dict[str, Any]
     current_answer: str
     decision: str
-    
+    # LangGraph only passes a node the keys declared on its annotated state type,
+    # so every field the agent nodes read has to be declared here.
+    current_difficulty: str
+    is_follow_up: bool
+    hint_count: int
+    follow_up_answers: List[str]
+    follow_up_scores: List[int]
+    follow_up_feedbacks: List[str]
+    feedback: Dict[str, Any]
+
 
 '''class InterviewState(TypedDict):
     topic: str
@@ -0,0 +1,279 @@
+import json
+import os
+import threading
+import uuid
+from pathlib import Path
+import numpy as np
+
+class VectorBackend:
+    """Storage and similarity search for question embeddings, used by VectorStore.
+
+    Documents are question texts; metadatas hold at least topic and difficulty.
+    Writes may be buffered until flush().
+    """
+
+    directory = None
+
+    def count(self) -> int:
+        raise NotImplementedError
+
+    def get(self) -> dict:
+        """All stored entries as {"ids": [...], "documents": [...], "metadatas": [...]}."""
+        raise NotImplementedError
+
+    def add(self, ids, documents, metadatas):
+        """Embed and insert or replace entries."""
+        raise NotImplementedError
+
+    def delete(self, ids):
+        raise NotImplementedError
+
+    def search(self, query, k, where) -> list[tuple[str, dict, float]]:
+        """Top k (document, metadata, distance) matching every field == value in where."""
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+class ChromaBackend(VectorBackend):
+    """Chroma persistent client (SQLite plus an HNSW index)."""
+
+    def __init__(self, collection_name, embedder, directory="data/chroma"):
+        # Imported here so that importing this module does not load chromadb.
+        from langchain_chroma import Chroma
+        self.directory = directory
+        self.store = Chroma(
+            collection_name=collection_name,
+            embedding_function=embedder,
+            persist_directory=directory
+        )
+
+    def count(self):
+        return self.store._collection.count()
+
+    def get(self):
+        return self.store.get(include=["metadatas", "documents"])
+
+    def add(self, ids, documents, metadatas):
+        from langchain_core.documents import Document
+        self.store.add_documents(
+            [Document(page_content=text, metadata=metadata) for text, metadata in zip(documents, metadatas)],
+            ids=ids
+        )
+
+    def delete(self, ids):
+        self.store.delete(ids=ids)
+
+    def search(self, query, k, where):
+        results = self.store.similarity_search_with_score(
+            query=query,
+            k=k,
+            filter={"$and": [{field: {"$eq": value}} for field, value in where.items()]}
+        )
+        return [(doc.page_content, doc.metadata, score) for doc, score in results]
+
+class NumpyBackend(VectorBackend):
+    """In-process store: a memory-mapped float32 matrix of normalized embeddings.
+
+    Files in directory, for collection "questions" written as stamp s (the
+    version number plus a random suffix):
+        questions.json          ids, documents, metadatas, filter vocabularies and s
+        questions.s.vectors.npy (n, dim) float32 embeddings
+        questions.s.codes.npy   (n, fields) int32 codes of the filter fields
+
+    Arrays are opened read-only with mmap, so worker processes on one host
+    share a single copy through the page cache. Rows are sorted by their filter
+    codes, so each topic and each (topic, difficulty) group is a contiguous
+    block and search is an exact dot product over a view of it. Writes are
+    buffered in memory until flush(), which writes a new version and switches
+    the JSON file to it; readers keep using the version they opened, which is
+    kept on disk until the following flush. Every flush writes new files and
+    the JSON file is replaced atomically, so processes flushing at the same
+    time never overwrite each other's (or a mapped) array, and the arrays
+    always match the ids of the JSON file that names them; the last flush wins.
+    """
+
+    def __init__(self, collection_name, embedder, directory="data/vectors", fields=("topic", "difficulty")):
+        self.directory = directory
+        self.embedder = embedder
+        self.name = collection_name
+        self.fields = list(fields)
+        self.lock = threading.Lock()
+        self.meta_path = Path(directory) / f"{collection_name}.json"
+        self.load()
+
+    def array_path(self, stamp, kind):
+        return self.meta_path.parent / f"{self.name}.{stamp}.{kind}.npy"
+
+    def load(self):
+        self.version = 0
+        self.stamp = None
+        self.ids, self.documents, self.metadatas = [], [], []
+        self.vocab = {field: [] for field in self.fields}
+        self.matrix = None
+        self.codes = np.zeros((0, len(self.fields)), dtype=np.int32)
+        if self.meta_path.exists():
+            with open(self.meta_path, "r") as f:
+                meta = json.load(f)
+            self.version = meta["version"]
+            # Files written before stamps were added are named by the version alone.
+            self.stamp = meta.get("stamp", str(self.version))
+            self.ids, self.documents, self.metadatas = meta["ids"], meta["documents"], meta["metadatas"]
+            self.vocab = meta["vocab"]
+            if self.ids:
+                self.matrix = np.load(self.array_path(self.stamp, "vectors"), mmap_mode="r")
+                self.codes = np.load(self.array_path(self.stamp, "codes"), mmap_mode="r")
+        self.position = {doc_id: i for i, doc_id in enumerate(self.ids)}
+        self.pending = []
+        self.deleted = set()
+        self.rows = {}
+
+    def disk_version(self):
+        try:
+            with open(self.meta_path, "r") as f:
+                return json.load(f)["version"]
+        except (OSError, ValueError, KeyError):
+            return 0
+
+    def count(self):
+        return len(self.position)
+
+    def get(self):
+        with self.lock:
+            self.consolidate()
+            return {"ids": list(self.ids), "documents": list(self.documents), "metadatas": list(self.metadatas)}
+
+    def add(self, ids, documents, metadatas):
+        vectors = np.asarray(self.embedder.embed_documents(list(documents)), dtype=np.float32)
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        with self.lock:
+            for doc_id, text, metadata in zip(ids, documents, metadatas):
+                if doc_id in self.position:
+                    self.deleted.add(self.position[doc_id])
+                self.position[doc_id] = len(self.ids)
+                self.ids.append(doc_id)
+                self.documents.append(text)
+                self.metadatas.append(metadata)
+            self.pending.append(vectors)
+
+    def delete(self, ids):
+        with self.lock:
+            for doc_id in ids:
+                row = self.position.pop(doc_id, None)
+                if row is not None:
+                    self.deleted.add(row)
+
+    def consolidate(self):
+        """Apply buffered adds and deletes to the in-memory arrays."""
+        if not self.pending and not self.deleted:
+            return
+        parts = ([np.asarray(self.matrix)] if self.matrix is not None else []) + self.pending
+        matrix = np.concatenate(parts) if parts else None
+        if self.deleted:
+            keep = [i for i in range(len(self.ids)) if i not in self.deleted]
+            matrix = matrix[keep] if matrix is not None else None
+            self.ids = [self.ids[i] for i in keep]
+            self.documents = [self.documents[i] for i in keep]
+            self.metadatas = [self.metadatas[i] for i in keep]
+        self.vocab = {field: sorted({str(m.get(field)) for m in self.metadatas}) for field in self.fields}
+        lookup = {field: {value: code for code, value in enumerate(values)} for field, values in self.vocab.items()}
+        codes = np.array(
+            [[lookup[field][str(m.get(field))] for field in self.fields] for m in self.metadatas],
+            dtype=np.int32
+        ).reshape(len(self.metadatas), len(self.fields))
+        # Group rows by filter codes, first field first, so filters on a prefix
+        # of the fields select a contiguous block.
+        order = np.lexsort(codes.T[::-1]) if len(codes) else np.arange(0)
+        self.codes = codes[order]
+        self.ids = [self.ids[i] for i in order]
+        self.documents = [self.documents[i] for i in order]
+        self.metadatas = [self.metadatas[i] for i in order]
+        self.matrix = matrix[order] if self.ids else None
+        self.position = {doc_id: i for i, doc_id in enumerate(self.ids)}
+        self.pending = []
+        self.deleted = set()
+        self.rows = {}
+
+    def filter_rows(self, where):
+        """Row numbers matching every field == value in where, memoized per filter."""
+        key = tuple(sorted((field, str(value)) for field, value in where.items()))
+        rows = self.rows.get(key)
+        if rows is None:
+            mask = np.ones(len(self.ids), dtype=bool)
+            for field, value in key:
+                values = self.vocab.get(field, [])
+                if value not in values:
+                    mask[:] = False
+                    break
+                mask &= self.codes[:, self.fields.index(field)] == values.index(value)
+            rows = self.rows[key] = np.flatnonzero(mask)
+        return rows
+
+    def search(self, query, k, where):
+        vector = np.asarray(self.embedder.embed_query(query), dtype=np.float32)
+        vector /= max(np.linalg.norm(vector), 1e-12)
+        with self.lock:
+            self.consolidate()
+            if self.matrix is None:
+                return []
+            # Consolidation replaces these instead of modifying them, so the
+            # dot product can run outside the lock.
+            matrix, documents, metadatas = self.matrix, self.documents, self.metadatas
+            rows = self.filter_rows(where)
+        if not len(rows):
+            return []
+        if rows[-1] - rows[0] + 1 == len(rows):
+            # A contiguous group: slicing is a view, fancy indexing would copy the rows.
+            similarity = matrix[rows[0]:rows[-1] + 1] @ vector
+        else:
+            similarity = matrix[rows] @ vector
+        k = min(k, len(rows))
+        top = np.argpartition(-similarity, k - 1)[:k]
+        top = top[np.argsort(-similarity[top])]
+        # Cosine distance, lower is closer (like Chroma's scores).
+        return [(documents[rows[i]], metadatas[rows[i]], float(1 - similarity[i])) for i in top]
+
+    def flush(self):
+        """Write buffered changes as a new version and reopen it memory-mapped."""
+        with self.lock:
+            if not self.pending and not self.deleted and self.meta_path.exists():
+                return
+            self.consolidate()
+            self.meta_path.parent.mkdir(parents=True, exist_ok=True)
+            # Continue from the newest version on disk, which another process may have written.
+            self.version = max(self.version, self.disk_version()) + 1
+            self.stamp = f"{self.version}-{uuid.uuid4().hex[:8]}"
+            if self.ids:
+                np.save(self.array_path(self.stamp, "vectors"), self.matrix)
+                np.save(self.array_path(self.stamp, "codes"), self.codes)
+            tmp_path = self.meta_path.with_name(f"{self.meta_path.name}.{self.stamp}.tmp")
+            with open(tmp_path, "w") as f:
+                json.dump({
+                    "version": self.version,
+                    "stamp": self.stamp,
+                    "ids": self.ids,
+                    "documents": self.documents,
+                    "metadatas": self.metadatas,
+                    "vocab": self.vocab
+                }, f)
+            os.replace(tmp_path, self.meta_path)
+            # Processes that opened the previous version may still be reading it,
+            # so only older ones are removed, whichever process wrote them.
+            for path in self.meta_path.parent.glob(f"{self.name}.*.npy"):
+                version = path.name[len(self.name) + 1:].split(".")[0].split("-")[0]
+                if version.isdigit() and int(version) < self.version - 1:
+                    try:
+                        path.unlink(missing_ok=True)
+                    except OSError:
+                        # Still mapped by a reader on a platform that forbids unlinking it.
+                        pass
+            if self.ids:
+                self.matrix = np.load(self.array_path(self.stamp, "vectors"), mmap_mode="r")
+                self.codes = np.load(self.array_path(self.stamp, "codes"), mmap_mode="r")
+
+BACKENDS = {"chroma": ChromaBackend, "numpy": NumpyBackend}
+
+def create_backend(name, collection_name, embedder):
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown vector backend '{name}', expected one of {', '.join(BACKENDS)}")
+    return BACKENDS[name](collection_name, embedder)
@@ -1,56 +1,174 @@
+import hashlib
 import json
+import logging
+import os
+import random
 from pathlib import Path
-from langchain_chroma import Chroma
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_core.documents import Document
+from utils.metrics import metrics
+from utils.topic_resolver import TopicResolver
+from utils.vector_backends import create_backend
 
 class VectorStore:
-    def __init__(self, collection_name="questions", data_path="data/questions.json"):
-        self.embedder = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
+    def __init__(self, collection_name="questions", data_path="data/questions.json", embedder=None, backend=None):
+        if embedder is None:
+            # Imported here so that importing this module does not load torch.
+            from langchain_huggingface import HuggingFaceEmbeddings
+            embedder = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
+        self.embedder = embedder
         self.data_path = Path(data_path)
-        self.vector_store = Chroma(
-            collection_name=collection_name,
-            embedding_function=self.embedder,
-            persist_directory="data/chroma"
-        )
+        # "chroma" (default) or "numpy"; see utils/vector_backends.py.
+        self.backend = create_backend(backend or os.getenv("VECTOR_BACKEND", "chroma"), collection_name, embedder)
+        # Hash of the last synced bank file, so unchanged banks skip the diff entirely.
+        self.sync_path = Path(self.backend.directory) / f"{collection_name}.sync.json"
+        self.index = {}
+        self.topic_resolver = None
         self.load_questions()
+        self.build_index()
+
+    def load_questions(self, batch_size=256, progress=None):
+        """Sync questions from JSON into the vector backend, embedding only added or changed items."""
+        with open(self.data_path, "rb") as f:
+            raw = f.read()
+        bank_hash = hashlib.sha256(raw).hexdigest()
+        if self.sync_state() == {"bank_hash": bank_hash, "count": self.backend.count()}:
+            return
+        questions = json.loads(raw)
+
+        wanted = {q["id"]: (q, self.content_hash(q)) for q in questions}
+        existing = self.backend.get()
+        stored = {
+            doc_id: metadata or {}
+            for doc_id, metadata in zip(existing["ids"], existing["metadatas"])
+        }
+
+        # Questions added by pregenerate.py are not in the JSON bank and are kept.
+        stale = [
+            doc_id for doc_id, metadata in stored.items()
+            if doc_id not in wanted and metadata.get("source") != "generated"
+        ]
+        changed = [q for q_id, (q, h) in wanted.items() if stored.get(q_id, {}).get("content_hash") != h]
+        for i in range(0, len(stale), batch_size):
+            self.backend.delete(stale[i:i + batch_size])
+        self.upsert_questions(changed, batch_size=batch_size, progress=progress)
+        self.backend.flush()
 
-    def load_questions(self):
-        """Load questions from JSON and store in ChromaDB."""
-        if self.vector_store._collection.count() == 0:
-            with open(self.data_path, "r") as f:
-                questions = json.load(f)
-            
-            documents = [
-                Document(
-                    page_content=q["question"],
-                    metadata={
-                        "id": q["id"],
-                        "topic": q["topic"],
-                        "answer_key": q["answer_key"],
-                        "difficulty": q["difficulty"]
-                    }
-                ) for q in questions
+        logging.info("Question bank synced: %d upserted, %d deleted, %d unchanged", len(changed), len(stale), len(wanted) - len(changed))
+        self.save_sync_state({"bank_hash": bank_hash, "count": self.backend.count()})
+
+    def upsert_questions(self, questions, source="bank", batch_size=256, progress=None):
+        """Embed and upsert questions (dicts with an id) in batches of batch_size."""
+        for i in range(0, len(questions), batch_size):
+            batch = questions[i:i + batch_size]
+            metadatas = [
+                {
+                    "id": q["id"],
+                    "topic": q["topic"],
+                    "answer_key": q["answer_key"],
+                    "difficulty": q["difficulty"],
+                    "content_hash": self.content_hash(q),
+                    "source": source
+                } for q in batch
             ]
-            self.vector_store.add_documents(documents)
+            with metrics.span("vector_upsert", source=source):
+                self.backend.add([q["id"] for q in batch], [q["question"] for q in batch], metadatas)
+            done = min(i + batch_size, len(questions))
+            logging.info("Embedded %d/%d questions", done, len(questions))
+            if progress:
+                progress(done, len(questions))
 
-    def retrieve_question(self, topic, difficulty, query=""):
-        """Retrieve a question by topic and difficulty."""
-        if not query:
-            query = f"{topic} {difficulty} interview question"
-        results = self.vector_store.similarity_search_with_score(
-            query=query,
-            k=1,
-            filter={"$and": [
-                {"topic": {"$eq": topic}},
-                {"difficulty": {"$eq": difficulty}}
-            ]}
+    def add_generated_questions(self, questions):
+        """Upsert generated questions and add them to the in-memory pools."""
+        self.upsert_questions(questions, source="generated")
+        self.backend.flush()
+        known_topics = {topic for topic, _ in self.index}
+        for q in questions:
+            self.index.setdefault((q["topic"], q["difficulty"]), []).append({
+                "id": q["id"],
+                "question": q["question"],
+                "answer_key": q["answer_key"],
+                "difficulty": q["difficulty"]
+            })
+        if {q["topic"] for q in questions} - known_topics:
+            self.topic_resolver = TopicResolver(self.embedder, [topic for topic, _ in self.index])
+        state = self.sync_state()
+        if state:
+            state["count"] = self.backend.count()
+            self.save_sync_state(state)
+
+    @staticmethod
+    def content_hash(question):
+        """Hash of the fields that are embedded or stored for a question."""
+        payload = json.dumps(
+            [question["question"], question["answer_key"], question["topic"], question["difficulty"]],
+            ensure_ascii=False
         )
-        if results:
-            doc, _ = results[0]
-            return {
-                "question": doc.page_content,
-                "answer_key": doc.metadata["answer_key"],
-                "difficulty": doc.metadata["difficulty"]
-            }
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def sync_state(self):
+        try:
+            with open(self.sync_path, "r") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def save_sync_state(self, state):
+        self.sync_path.parent.mkdir(parents=True, exist_ok=True)
+        # Replaced atomically, as several processes may sync on startup.
+        tmp_path = self.sync_path.with_name(f"{self.sync_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.sync_path)
+
+    def build_index(self, shuffle=True):
+        """Group stored questions into a pool per (topic, difficulty) for constant-time retrieval."""
+        stored = self.backend.get()
+        index = {}
+        for text, metadata in zip(stored["documents"], stored["metadatas"]):
+            index.setdefault((metadata["topic"], metadata["difficulty"]), []).append({
+                "id": metadata.get("id"),
+                "question": text,
+                "answer_key": metadata["answer_key"],
+                "difficulty": metadata["difficulty"]
+            })
+        for pool in index.values():
+            if shuffle:
+                random.shuffle(pool)
+            else:
+                pool.sort(key=lambda q: q["id"] or "")
+        self.index = index
+        self.topic_resolver = TopicResolver(self.embedder, [topic for topic, _ in index])
+        logging.info("Indexed %d questions in %d topic/difficulty pools", sum(len(p) for p in index.values()), len(index))
+
+    def resolve_topic(self, topic):
+        """Map user input like "ML" or "python" to the bank's canonical topic name."""
+        if self.topic_resolver is None:
+            return topic
+        return self.topic_resolver.resolve(topic)
+
+    def retrieve_question(self, topic, difficulty, query="", exclude=()):
+        """Retrieve an unused question by topic and difficulty.
+
+        Without a query the first question in the (topic, difficulty) pool whose
+        text is not in exclude is returned; with a query a similarity search is run.
+        """
+        with metrics.span("topic_resolve"):
+            topic = self.resolve_topic(topic)
+        if topic is None:
+            return None
+        if not query:
+            with metrics.span("retrieval", mode="pool"):
+                for question in self.index.get((topic, difficulty), []):
+                    if question["question"] not in exclude:
+                        return dict(question)
+            return None
+        with metrics.span("vector_query", mode="similarity"):
+            results = self.backend.search(query, len(exclude) + 1, {"topic": topic, "difficulty": difficulty})
+        for text, metadata, _ in results:
+            if text not in exclude:
+                return {
+                    "id": metadata.get("id"),
+                    "question": text,
+                    "answer_key": metadata["answer_key"],
+                    "difficulty": metadata["difficulty"]
+                }
         return None
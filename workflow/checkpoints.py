@@ -0,0 +1,17 @@
+import sqlite3
+from pathlib import Path
+
+CHECKPOINT_PATH = "data/checkpoints.sqlite"
+
+def sqlite_checkpointer(path=CHECKPOINT_PATH):
+    """Durable checkpointer for synchronous graphs (main.py)."""
+    from langgraph.checkpoint.sqlite import SqliteSaver
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    return SqliteSaver(sqlite3.connect(path, check_same_thread=False))
+
+async def async_sqlite_checkpointer(path=CHECKPOINT_PATH):
+    """Durable checkpointer shared by all headless sessions."""
+    import aiosqlite
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    return AsyncSqliteSaver(await aiosqlite.connect(path))
@@ -1,23 +1,47 @@
 from langgraph.graph import StateGraph, END
 from agents.agent import InterviewerAgent
 from utils.types import InterviewState
-import logging
+import asyncio
+import functools
+from utils.event_log import log_event
+from utils.metrics import metrics
 
 class InterviewState(InterviewState):
     current_difficulty: str
     is_follow_up: bool
     hint_count: int
 
-def build_graph(agent: InterviewerAgent):
+def build_graph(agent: InterviewerAgent, headless: bool = False, checkpointer=None):
+    """Build the interview graph.
+
+    With headless=True the nodes are coroutines that run on a shared executor,
+    the topic comes from the input state, and the graph is interrupted before
+    collect_answer so the caller can write current_answer and resume.
+    """
     workflow = StateGraph(InterviewState)
 
-    workflow.add_node("select_topic", agent.select_topic)
-    workflow.add_node("generate_question", agent.generate_question)
-    workflow.add_node("collect_answer", agent.collect_answer)
-    workflow.add_node("evaluate_answer", agent.evaluate_answer)
-    workflow.add_node("generate_hint", agent.generate_hint)
-    workflow.add_node("decide_next", decide_next)
-    workflow.add_node("generate_feedback", agent.generate_feedback)
+    if headless:
+        nodes = {
+            "select_topic": agent.async_node(agent.start_topic),
+            "generate_question": agent.async_node(agent.generate_question),
+            "collect_answer": agent.async_node(agent.collect_submitted_answer),
+            "evaluate_answer": agent.async_node(agent.evaluate_answer),
+            "generate_hint": agent.async_node(agent.generate_hint),
+            "decide_next": adecide_next,
+            "generate_feedback": agent.async_node(agent.generate_feedback)
+        }
+    else:
+        nodes = {
+            "select_topic": agent.select_topic,
+            "generate_question": agent.generate_question,
+            "collect_answer": agent.collect_answer,
+            "evaluate_answer": agent.evaluate_answer,
+            "generate_hint": agent.generate_hint,
+            "decide_next": decide_next,
+            "generate_feedback": agent.generate_feedback
+        }
+    for name, node in nodes.items():
+        workflow.add_node(name, traced(name, node))
 
     workflow.set_entry_point("select_topic")
     workflow.add_edge("select_topic", "generate_question")
@@ -36,7 +60,10 @@ def build_graph(agent: InterviewerAgent):
     workflow.add_edge("generate_hint", "collect_answer")
     workflow.add_edge("generate_feedback", END)
 
-    return workflow.compile()
+    if headless:
+        from langgraph.checkpoint.memory import MemorySaver
+        return workflow.compile(checkpointer=checkpointer or MemorySaver(), interrupt_before=["collect_answer"])
+    return workflow.compile(checkpointer=checkpointer)
 
 def decide_next(state: InterviewState) -> InterviewState:
     difficulty_levels = ["easy", "medium", "hard"]
@@ -46,14 +73,18 @@ def decide_next(state: InterviewState) -> InterviewState:
     if state.get("decision") == "end" or state.get("question_count", 0) >= 5:
         state["decision"] = "end"
         state["is_follow_up"] = False
-        logging.info(f"Decision: end (question_count={state['question_count']})")
+        log_event("decision", "Decision: end (question_count=%d)", state["question_count"], decision="end")
         return state
 
     last_score = state["scores"][-1] if state["scores"] else 0
     if last_score < 4 and state.get("hint_count", 0) < 1:
         state["decision"] = "hint"
         state["current_difficulty"] = difficulty_levels[max(0, current_index - 1)]
-        logging.info(f"Decision: hint (score={last_score}, hint_count={state['hint_count']}, new_difficulty={state['current_difficulty']})")
+        log_event(
+            "decision", "Decision: hint (score=%s, hint_count=%d, new_difficulty=%s)",
+            last_score, state["hint_count"], state["current_difficulty"],
+            decision="hint", score=last_score, difficulty=state["current_difficulty"]
+        )
     else:
         state["decision"] = "continue"
         state["is_follow_up"] = False
@@ -64,7 +95,26 @@ def decide_next(state: InterviewState) -> InterviewState:
         else:
             state["current_difficulty"] = current_difficulty
         state["hint_count"] = 0
-        logging.info(f"Decision: continue (score={last_score}, new_difficulty={state['current_difficulty']})")
+        log_event(
+            "decision", "Decision: continue (score=%s, new_difficulty=%s)", last_score, state["current_difficulty"],
+            decision="continue", score=last_score, difficulty=state["current_difficulty"]
+        )
 
     return state
 
+def traced(name: str, node):
+    """Wrap a graph node so its wall time is recorded in the node_seconds histogram."""
+    if asyncio.iscoroutinefunction(node):
+        @functools.wraps(node)
+        async def run(state: InterviewState) -> InterviewState:
+            with metrics.span("node", node=name):
+                return await node(state)
+    else:
+        @functools.wraps(node)
+        def run(state: InterviewState) -> InterviewState:
+            with metrics.span("node", node=name):
+                return node(state)
+    return run
+
+async def adecide_next(state: InterviewState) -> InterviewState:
+    return decide_next(state)
@@ -0,0 +1,227 @@
+import asyncio
+import logging
+import time
+import uuid
+from agents.agent import InterviewerAgent
+from utils.event_log import set_session_id
+from utils.metrics import metrics
+from utils.topic_resolver import MIN_TOPIC_LENGTH, valid_topic
+from workflow.checkpoints import async_sqlite_checkpointer
+from workflow.graph import build_graph
+
+class Session:
+    def __init__(self, session_id: str, topic: str, checkpointer=None):
+        self.id = session_id
+        self.topic = topic
+        self.agent = InterviewerAgent()
+        # Headless sessions never write to the console.
+        self.agent.output = lambda *args, **kwargs: None
+        self.graph = build_graph(self.agent, headless=True, checkpointer=checkpointer)
+        self.config = {"configurable": {"thread_id": session_id}, "recursion_limit": 50}
+        self.events = asyncio.Queue()
+        self.task = None
+        self.summary = None
+        self.done = False
+        # Reloaded from a checkpoint and its queue holds only the replayed question.
+        self.resumed = False
+        self.last_active = time.monotonic()
+
+class InterviewServer:
+    """Asyncio API running many headless interviews in one process.
+
+    Each session is a LangGraph run interrupted before collect_answer. While a
+    candidate is thinking the session holds no thread; blocking LLM and vector
+    store work runs on shared, bounded executors.
+
+        server = InterviewServer()
+        session_id = await server.start_interview("Python")
+        event = await server.next_event(session_id)   # {"type": "question", ...}
+        await server.submit_answer(session_id, "...")
+
+    With a checkpoint_path every node is checkpointed to SQLite: sessions idle
+    for idle_timeout seconds are evicted from memory by a background task
+    running every evict_interval seconds and transparently reloaded by ID,
+    including after a server restart.
+    """
+
+    def __init__(self, max_sessions: int = 1000, checkpoint_path: str = None, idle_timeout: float = 600,
+                 evict_interval: float = 60):
+        self.max_sessions = max_sessions
+        self.checkpoint_path = checkpoint_path
+        self.idle_timeout = idle_timeout
+        self.evict_interval = evict_interval
+        self.checkpointer = None
+        # Concurrent first sessions must not each open a connection.
+        self.checkpointer_lock = asyncio.Lock()
+        self.evictor = None
+        self.sessions = {}
+
+    async def get_checkpointer(self):
+        if self.checkpoint_path and self.checkpointer is None:
+            async with self.checkpointer_lock:
+                if self.checkpointer is None:
+                    self.checkpointer = await async_sqlite_checkpointer(self.checkpoint_path)
+        if self.checkpoint_path and self.evictor is None:
+            # Started here because the server may be created outside the event loop.
+            self.evictor = asyncio.create_task(self.evict_periodically())
+        return self.checkpointer
+
+    async def start_interview(self, topic: str) -> str:
+        topic = topic.strip()
+        if not valid_topic(topic):
+            raise ValueError(f"Topic must be at least {MIN_TOPIC_LENGTH} characters.")
+        self.evict_idle()
+        if len(self.sessions) >= self.max_sessions:
+            raise RuntimeError("Too many active interview sessions.")
+        session = Session(uuid.uuid4().hex, topic, await self.get_checkpointer())
+        self.sessions[session.id] = session
+        session.task = asyncio.create_task(self.advance(session, {"topic": topic}))
+        logging.info("Started headless interview %s on %s", session.id, topic)
+        return session.id
+
+    async def submit_answer(self, session_id: str, answer: str):
+        session = await self.load_session(session_id)
+        if session.done:
+            raise RuntimeError("Interview has already finished.")
+        if session.task and not session.task.done():
+            raise RuntimeError("Session is not waiting for an answer yet.")
+        snapshot = await session.graph.aget_state(session.config)
+        if "collect_answer" not in snapshot.next:
+            raise RuntimeError("Session is not waiting for an answer.")
+        if session.resumed:
+            # The replayed question was for a client that lost track of the session;
+            # this one already answers it, so it must not see the question again.
+            while not session.events.empty():
+                session.events.get_nowait()
+            session.resumed = False
+        await session.graph.aupdate_state(session.config, {"current_answer": answer})
+        session.task = asyncio.create_task(self.advance(session, None))
+
+    async def next_event(self, session_id: str, timeout: float = None) -> dict:
+        session = await self.load_session(session_id)
+        return await asyncio.wait_for(session.events.get(), timeout)
+
+    async def get_summary(self, session_id: str) -> dict | None:
+        """Return the final feedback, or None while the interview is still running."""
+        return (await self.load_session(session_id)).summary
+
+    def metrics_text(self) -> str:
+        """Latency histograms and counters in Prometheus text format, e.g. for a /metrics endpoint."""
+        return metrics.prometheus()
+
+    async def close(self):
+        """Cancel running sessions and the evictor, and close the checkpoint database."""
+        if self.evictor is not None:
+            self.evictor.cancel()
+            self.evictor = None
+        for session_id in list(self.sessions):
+            self.close_session(session_id)
+        if self.checkpointer is not None:
+            await self.checkpointer.conn.close()
+            self.checkpointer = None
+
+    def close_session(self, session_id: str):
+        session = self.sessions.pop(session_id, None)
+        if session and session.task and not session.task.done():
+            session.task.cancel()
+
+    async def load_session(self, session_id: str) -> Session:
+        """Return the in-memory session, reloading it from its checkpoint if it was evicted."""
+        session = self.sessions.get(session_id)
+        if session is None and self.checkpoint_path:
+            session = Session(session_id, "", await self.get_checkpointer())
+            snapshot = await session.graph.aget_state(session.config)
+            if snapshot.values:
+                session.topic = snapshot.values.get("topic", "")
+                session.agent.restore(snapshot.values)
+                session.summary = snapshot.values.get("feedback")
+                session.done = not snapshot.next
+                if "collect_answer" in snapshot.next:
+                    await session.events.put({
+                        "type": "follow_up" if snapshot.values.get("is_follow_up") else "question",
+                        "number": snapshot.values["question_count"],
+                        "question": snapshot.values["current_question"]["question"],
+                        "resumed": True
+                    })
+                    await session.events.put({"type": "awaiting_answer"})
+                    session.resumed = True
+                self.sessions[session_id] = session
+                logging.info("Reloaded headless interview %s from checkpoint", session_id)
+            else:
+                session = None
+        if session is None:
+            raise KeyError(f"Unknown interview session: {session_id}")
+        session.last_active = time.monotonic()
+        return session
+
+    def evict_idle(self):
+        """Drop idle sessions from memory; their state stays in the checkpoint database."""
+        if not self.checkpoint_path:
+            return
+        cutoff = time.monotonic() - self.idle_timeout
+        idle = [
+            session_id for session_id, session in self.sessions.items()
+            if session.last_active < cutoff and session.events.empty()
+            and (session.task is None or session.task.done())
+        ]
+        for session_id in idle:
+            del self.sessions[session_id]
+        if idle:
+            logging.info("Evicted %d idle interview sessions", len(idle))
+
+    async def evict_periodically(self):
+        while True:
+            await asyncio.sleep(self.evict_interval)
+            self.evict_idle()
+
+    async def advance(self, session: Session, graph_input):
+        """Run the graph until it waits for an answer or finishes, queueing events."""
+        # Each advance runs in its own task, so this only tags this session's records.
+        set_session_id(session.id)
+        try:
+            # "updates" names the node that ran; the following "values" chunk is
+            # the full state after it (updates only carry the changed keys).
+            nodes = []
+            async for mode, chunk in session.graph.astream(graph_input, session.config, stream_mode=["updates", "values"]):
+                if mode == "updates":
+                    nodes = [node for node in chunk if not node.startswith("__")]
+                    continue
+                for node in nodes:
+                    event = self.event_for(session, node, chunk)
+                    if event:
+                        await session.events.put(event)
+                nodes = []
+            snapshot = await session.graph.aget_state(session.config)
+            if "collect_answer" in snapshot.next:
+                await session.events.put({"type": "awaiting_answer"})
+            elif not snapshot.next:
+                session.done = True
+                await session.events.put({"type": "finished"})
+        except Exception as e:
+            logging.exception("Headless interview %s failed", session.id)
+            await session.events.put({"type": "error", "message": str(e)})
+
+    def event_for(self, session: Session, node: str, state: dict) -> dict | None:
+        if node == "generate_question" and state.get("decision") != "end":
+            return {
+                "type": "question",
+                "number": state["question_count"],
+                "question": state["current_question"]["question"]
+            }
+        if node == "evaluate_answer":
+            follow_up = state.get("is_follow_up", False)
+            return {
+                "type": "evaluation",
+                "follow_up": follow_up,
+                "score": (state["follow_up_scores"] if follow_up else state["scores"])[-1],
+                "feedback": (state["follow_up_feedbacks"] if follow_up else state["feedbacks"])[-1]
+            }
+        if node == "generate_hint":
+            if state.get("is_follow_up"):
+                return {"type": "follow_up", "question": state["current_question"]["question"]}
+            if state.get("history") and state["history"][-1]["kind"] == "hint":
+                return {"type": "hint", "hint": state["history"][-1]["text"]}
+        if node == "generate_feedback":
+            session.summary = state.get("feedback")
+            return {"type": "summary", "feedback": session.summary}
+        return None